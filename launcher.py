@@ -11,17 +11,21 @@ Author: Project Developer
 License: MIT
 """
 
+from utils.config_utils import get_user_configuration
 from utils.logging_utils import (
-    create_logger
+    create_logger,
+    stop_logger
 ) 
-from utils.export_utils import (
-    cols
+from utils.state import (
+    data_path,
+    load_existing_data,
+    save_data
+) 
+from utils.playwright_utils import (
+    main,
+    load_failed_urls
 ) 
-from utils.playwright_utils import main 
-import pandas as pd 
 import logging 
-import os 
-import pickle  
 import asyncio 
 from typing import List, Dict, Any, Set
 
@@ -31,48 +35,6 @@ failed_urls: Set[str] = set()
 products_urls: Set[str] = set()
 logger: logging.Logger = None
 
-def get_user_configuration() -> tuple[int, bool]:
-    """
-    Get user configuration for the scraper.
-    
-    Returns:
-        tuple[int, bool]: (number of concurrent tabs, headless mode)
-    """
-    try:
-        pages_number = int(input('How many tabs do you want: '))
-        if pages_number <= 0:
-            print("Invalid number of tabs. Using default value of 5.")
-            pages_number = 5
-    except ValueError:
-        print("Invalid input. Using default value of 5 tabs.")
-        pages_number = 5
-    
-    headless_sign = input('Enter y if you want to see the browser and n if not: ').lower()
-    headless = headless_sign != 'y'
-    
-    return pages_number, headless
-
-def load_existing_data() -> None:
-    """
-    Load existing data from pickle file if available.
-    
-    This function checks for existing data.pkl file and loads it if found,
-    otherwise initializes an empty data list.
-    """
-    global data, cols
-    
-    if os.path.exists('data.pkl'):
-        try:
-            df = pd.DataFrame(pickle.load(open('data.pkl', 'rb')))
-            data = df[~df[cols].duplicated()].to_dict(orient='records')
-            logger.info(f"Loaded {len(data)} existing records from data.pkl")
-        except Exception as e:
-            logger.error(f"Error loading existing data: {e}")
-            data = []
-    else:
-        data = []
-        logger.info("No existing data found, starting fresh")
-
 def initialize_global_variables() -> None:
     """
     Initialize global variables and data structures.
@@ -87,10 +49,10 @@ def initialize_global_variables() -> None:
     logger.info("Initializing Black Eagle Arrows Inventory Scraper")
     
     # Load existing data
-    load_existing_data()
+    data = load_existing_data(logger)
     
-    # Initialize empty sets for tracking
-    failed_urls = set()
+    # Initialize sets for tracking
+    failed_urls = load_failed_urls()
     products_urls = set()
     
     logger.info("Global variables initialized successfully")
@@ -137,10 +99,14 @@ def main_launcher() -> None:
         # Save progress
         if data:
             try:
-                pickle.dump(data, open('data.pkl', 'wb'))
-                logger.info("Progress saved to data.pkl")
+                save_data(data)
+                logger.info(f"Progress saved to {data_path}")
             except Exception as e:
                 logger.error(f"Failed to save progress: {e}")
+        
+        # Flush queued log records
+        if logger:
+            stop_logger(logger)
 
 if __name__ == '__main__':
     main_launcher()
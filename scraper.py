@@ -23,36 +23,26 @@ from playwright.async_api._generated import ElementHandle
 from playwright._impl._api_types import Error
 from jinja2 import Environment, FileSystemLoader
 import asyncio
-from parsel import Selector 
-from typing import List, Dict, Any, Set, Optional, Tuple
+from lxml import html as lxml_html
+from lxml.etree import XPath, tostring
+from typing import List, Dict, Any, Set, Optional, Tuple, Iterator
 from itertools import product 
-from copy import deepcopy 
+from collections import Counter
+from math import prod
 import sys 
 from datetime import datetime 
-from re import sub, compile
+from re import compile, DOTALL
 import pickle 
 import os 
-import openpyxl 
-from openpyxl.worksheet.hyperlink import Hyperlink
 from json.decoder import JSONDecodeError
+from utils.logging_utils import create_logger, stop_logger
+from utils.export_utils import write_excel
+from utils.state import load_existing_data, save_data, append_data_journal, droplist_keys
+from utils.config_utils import get_user_configuration
 
-# Global configuration
-PAGES_NUMBER = int(input('How many tabs do you want: '))
-HEADLESS_SIGN = input('Enter y if you want to see the browser and n if not: ')
-HEADLESS = False if HEADLESS_SIGN == 'y' else True
-
-# Columns that uniquely identify a production variation
-COLS = [
-    'SKU',
-    '1DroplistDesc',
-    '1DroplistValue',
-    '2DroplistDesc',
-    '2DroplistValue',
-    '3DroplistDesc',
-    '3DroplistValue',
-    '4DroplistDesc',
-    '4DroplistValue'
-]
+# Global configuration, set from user input in main()
+PAGES_NUMBER = 5
+HEADLESS = True
 
 # List of all available listing pages on the site
 LISTING_URLS = [
@@ -65,98 +55,116 @@ LISTING_URLS = [
 # Characters to clean from file names
 NAME_CLEANING_LIST = ['/', '"']
 
+# Precompiled patterns for file name and description cleanup
+_RE_TAG = compile(r'<[^>]+>')
+_RE_WS = compile(r'\s+')
+_RE_A = compile(r'<a[^>]*>(.*?)</a>', DOTALL)
+_RE_NUMBER = compile(r'\d+')
+
+# Precompiled XPath expressions used for extraction
+_XP_PAGINATION = XPath('//a[contains(@class,"listing-pagination-link")]')
+_XP_PRODUCT_LINKS = XPath('//div[contains(@class,"product-item-image")]//a/@href', smart_strings=False)
+
+# Collects every product page field in the browser with a single round trip
+PRODUCT_FIELDS_SCRIPT = """() => {
+    const evaluate = (expression, type) => document.evaluate(expression, document, null, type, null);
+    const text = (expression) => evaluate(`string(${expression})`, XPathResult.STRING_TYPE).stringValue;
+    const first = (expression) => {
+        const node = evaluate(expression, XPathResult.FIRST_ORDERED_NODE_TYPE).singleNodeValue;
+        return node ? node.nodeValue : null;
+    };
+    const description = document.querySelector('section#description');
+    return {
+        brand: text('//a[@class="product-brand"]'),
+        product_name: first('//h1/text()'),
+        price: text('(//span[@class="price price--withoutTax"])[1]'),
+        image: first('//img[contains(@class,"product-main-image-slide")]/@src'),
+        description: description ? description.outerHTML : null
+    };
+}"""
+
+# Cart endpoint answering every add-to-cart click
+CART_ADD_URL = '**/remote/v1/cart/add'
+
+# Storefront endpoint refreshed whenever a product option changes
+VARIANT_UPDATE_URL = '/remote/v1/product-attributes/'
+
+# New records are journaled after every URL, and the full data is written
+# after this many handled URLs
+CHECKPOINT_EVERY = 50
+
 # Global data containers
 data: List[Dict[str, Any]] = []
 failed_urls: Set[str] = set()
 products_urls: Set[str] = set()
+url_counts: Counter[str] = Counter()
 logger: logging.Logger = None
 
-def create_logger(logging_level: int) -> logging.RootLogger:
+# Checkpoint state
+_checkpoint_lock = asyncio.Lock()
+_journaled_count = 0
+_handled_since_checkpoint = 0
+
+async def check_handled_url(page: Page) -> bool:
     """
-    Create and configure a logger with both console and file handlers.
+    Check if the URL has been processed before by comparing product combinations.
     
     Args:
-        logging_level: Logging level (e.g., logging.DEBUG, logging.INFO)
+        page: Playwright page object
         
     Returns:
-        logging.RootLogger: Configured logger instance
-    """
-    Path(__file__).parent.joinpath('logs').mkdir(exist_ok=True)
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging_level)
-    
-    # Console handler
-    stream_handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter('%(levelname)s:%(message)s')
-    stream_handler.setFormatter(formatter)
-    
-    # File handler
-    timestamp = str(datetime.now()).replace(":", "")
-    file_handler = logging.FileHandler(f'logs/logs_{timestamp}.log')
-    file_handler.setFormatter(formatter)
-    
-    logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
-    return logger
-
-def load_existing_data() -> None:
-    """
-    Load existing data from pickle file if available, otherwise initialize empty data.
+        bool: True if URL has been handled, False otherwise
     """
-    global data
-    if os.path.exists('data.pkl'):
-        df = pd.DataFrame(pickle.load(open('data.pkl', 'rb')))
-        data = df[~df[COLS].duplicated()].to_dict(orient='records')
-        logger.info(f"Loaded {len(data)} existing records from data.pkl")
-    else:
-        data = []
-        logger.info("No existing data found, starting fresh")
+    handled = url_counts.get(page.url, 0)
+    if not handled:
+        return False
+    attrs_dict = await get_options_dict(page)
+    return handled >= prod(len(values) for values in attrs_dict.values())
 
-async def check_handled_url(page: Page) -> bool:
+async def snapshot(page: Page) -> lxml_html.HtmlElement:
     """
-    Check if the URL has been processed before by comparing product combinations.
+    Serialize the page DOM once and parse it with lxml.
     
     Args:
         page: Playwright page object
         
     Returns:
-        bool: True if URL has been handled, False otherwise
+        lxml_html.HtmlElement: Parsed page
     """
-    global data
-    attrs_dict = await get_options_dict(page)
-    all_combinations = get_all_combinations(*(attrs_dict.values()))
-    return len(list(all_combinations)) == len([item['product_name'] == page.url for item in data])
+    return lxml_html.fromstring(await page.content())
 
-async def get_total_pages(page: Page) -> int:
+def get_total_pages(tree: lxml_html.HtmlElement) -> int:
     """
     Get the total number of pages for a listing page.
     
     Args:
-        page: Playwright page object
+        tree: Parsed listing page
         
     Returns:
         int: Total number of pages, defaults to 1 if pagination not found
     """
-    selector = Selector(text=await page.content())
     try:
-        pagination_numbers = selector.xpath('//a[contains(@class,"listing-pagination-link")]').re(r'\d+')
+        pagination_numbers = [
+            number
+            for link in _XP_PAGINATION(tree)
+            for number in _RE_NUMBER.findall(tostring(link, encoding='unicode', with_tail=False))
+        ]
         return max([int(number) for number in pagination_numbers]) if pagination_numbers else 1
     except ValueError:
         logger.warning("Could not determine total pages, defaulting to 1")
         return 1
 
-async def get_page_products_urls(page: Page) -> List[str]:
+def get_page_products_urls(tree: lxml_html.HtmlElement) -> List[str]:
     """
     Extract all product URLs from a listing page.
     
     Args:
-        page: Playwright page object
+        tree: Parsed listing page
         
     Returns:
         List[str]: List of product URLs found on the page
     """
-    selector = Selector(text=await page.content())
-    return selector.xpath('//div[contains(@class,"product-item-image")]//a/@href').getall()
+    return _XP_PRODUCT_LINKS(tree)
 
 def format_date() -> str:
     """
@@ -180,14 +188,14 @@ def clean_file_name(name: str) -> str:
     """
     for element in NAME_CLEANING_LIST:
         name = name.replace(element, ' ')
-    return sub(r'\s+', ' ', name) + '.html'
+    return _RE_WS.sub(' ', name) + '.html'
 
-def save_description(selector: Selector, product_item: Dict[str, Any]) -> str:
+def save_description(description_content: Optional[str], product_item: Dict[str, Any]) -> str:
     """
     Save product description to HTML file.
     
     Args:
-        selector: Parsel selector object
+        description_content: Description section HTML
         product_item: Product data dictionary
         
     Returns:
@@ -197,7 +205,6 @@ def save_description(selector: Selector, product_item: Dict[str, Any]) -> str:
     description_folder.mkdir(exist_ok=True)
     description_path = description_folder.joinpath(clean_file_name(product_item['product_name']))
     
-    description_content = selector.xpath('//section[@id="description"]').get()
     with open(description_path, 'w', encoding='utf-8') as file:
         file.write(description_content if description_content else '')
     
@@ -207,6 +214,9 @@ async def get_product_item(page: Page) -> Dict[str, Any]:
     """
     Extract initial product information from a product page.
     
+    All fields, including the description HTML, are read in the browser by a
+    single evaluate call instead of serializing and re-parsing the whole page.
+    
     Args:
         page: Playwright page object
         
@@ -214,12 +224,12 @@ async def get_product_item(page: Page) -> Dict[str, Any]:
         Dict[str, Any]: Dictionary containing product information
     """
     global data
-    selector = Selector(text=await page.content())
+    fields = await page.evaluate(PRODUCT_FIELDS_SCRIPT)
     
     product_item = {
-        'SKU': '',  # selector.xpath('string(//span[contains(text(),"SKU")]/following-sibling::span[1])').get().strip()
-        'Brand': selector.xpath('string(//a[@class="product-brand"])').get().strip(),
-        'product_name': selector.xpath('//h1/text()').get(),
+        'SKU': '',  # string(//span[contains(text(),"SKU")]/following-sibling::span[1])
+        'Brand': fields['brand'].strip(),
+        'product_name': fields['product_name'],
         'URL': page.url,
         '1DroplistDesc': '',
         '1DroplistValue': '',
@@ -229,35 +239,38 @@ async def get_product_item(page: Page) -> Dict[str, Any]:
         '3DroplistValue': '',
         '4DroplistDesc': '',
         '4DroplistValue': '',
-        'Price': selector.xpath('string((//span[@class="price price--withoutTax"])[1])').get().strip(),
+        'Price': fields['price'].strip(),
         'Current stock': 0,
         'Current stock date': format_date(),
         'Previous stock': 0,
         'Previous stock date': '',
         'Description_path': '',
         'Description': '',
-        'Item photo URL': selector.xpath('//img[contains(@class,"product-main-image-slide")]/@src').get()
+        'Item photo URL': fields['image']
     }
     
     # Save description and update paths
-    product_item['Description_path'] = save_description(selector, product_item)
-    product_item['Description'] = selector.xpath('//section[@id="description"]').get()
+    description_content = fields['description']
+    product_item['Description_path'] = save_description(description_content, product_item)
+    product_item['Description'] = description_content
     product_item['Description'] = remove_hyperlinks(product_item)
     
     return product_item
 
-def export() -> None:
+def export(records: List[Dict[str, Any]]) -> None:
     """
     Export the extracted data to CSV file.
+    
+    Args:
+        records: Product records to export
     """
-    global data
     output_folder = Path(__file__).parent.joinpath('outputs')
     output_folder.mkdir(exist_ok=True)
     
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(records)
     output_path = output_folder.joinpath('output.csv')
     df.to_csv(output_path, index=False)
-    logger.info(f"Exported {len(data)} records to {output_path}")
+    logger.info(f"Exported {len(records)} records to {output_path}")
 
 async def handle_url(browser: Browser, url: str) -> None:
     """
@@ -288,23 +301,64 @@ async def handle_url(browser: Browser, url: str) -> None:
             logger.info('No adding cart button available')
             logger.info(f'Item scraped: {primary_item["product_name"]}')
             data.append(primary_item)
+            url_counts[primary_item['URL']] += 1
         else:
             try:
                 await inventory_identifier(page, primary_item)
             except TimeoutError:
                 logger.error(f'Timeout problem in link: {url}')
                 failed_urls.add(url)
-                pickle.dump(failed_urls, open('failed_urls.pkl', 'wb'))
                 
     except Exception as e:
         logger.error(f"Error processing URL {url}: {e}")
         failed_urls.add(url)
     finally:
-        export()
-        pickle.dump(data, open('data.pkl', 'wb'))
+        await checkpoint()
         await page.close()
         await context.close()
 
+async def checkpoint(force: bool = False) -> None:
+    """
+    Persist the scraped data and failed URLs after a handled URL.
+    
+    Only the records added since the previous call are appended to the data
+    journal. Every CHECKPOINT_EVERY URLs (or when forced) the full data and
+    the failed URLs are written. The file writes run in a worker thread so
+    other tabs keep scraping meanwhile.
+    
+    Args:
+        force: Write a full checkpoint regardless of the URL counter
+    """
+    global _journaled_count, _handled_since_checkpoint
+    
+    async with _checkpoint_lock:
+        new_records = data[_journaled_count:]
+        _journaled_count = len(data)
+        
+        _handled_since_checkpoint += 1
+        if not force and _handled_since_checkpoint < CHECKPOINT_EVERY:
+            await asyncio.to_thread(append_data_journal, new_records)
+            return
+        _handled_since_checkpoint = 0
+        
+        await asyncio.to_thread(write_checkpoint, list(data), set(failed_urls))
+
+def write_checkpoint(records: List[Dict[str, Any]], failed: Set[str]) -> None:
+    """
+    Write a full checkpoint of the scraped data and failed URLs.
+    
+    The data checkpoint also truncates the journal, so new records need no
+    separate append.
+    
+    Args:
+        records: Full data snapshot to write to data.json and output.csv
+        failed: Snapshot of the failed URLs
+    """
+    export(records)
+    save_data(records)
+    with open('failed_urls.pkl', 'wb') as file:
+        pickle.dump(failed, file, protocol=pickle.HIGHEST_PROTOCOL)
+
 async def handle_listing(browser: Browser, listing_url: str) -> None:
     """
     Handle the listing page extraction logic to collect product URLs.
@@ -321,15 +375,17 @@ async def handle_listing(browser: Browser, listing_url: str) -> None:
     
     try:
         await page.goto(listing_url)
-        total_pages = await get_total_pages(page)
+        tree = await snapshot(page)
+        total_pages = get_total_pages(tree)
         
         logger.info(f"Processing listing: {listing_url} with {total_pages} pages")
         
         for page_num in range(1, total_pages + 1):
             if page_num > 1:
                 await page.goto(f"{listing_url}?page={page_num}", timeout=60000)
+                tree = await snapshot(page)
             
-            product_urls = await get_page_products_urls(page)
+            product_urls = get_page_products_urls(tree)
             products_urls.update(product_urls)
             logger.info(f"Page {page_num}: Found {len(product_urls)} products")
             
@@ -381,22 +437,46 @@ async def select_attr_option(option_handle: ElementHandle, attr_value: str) -> N
     """
     await option_handle.select_option(attr_value)
 
-def get_all_combinations(*lists: List[str]) -> List[Tuple[str, ...]]:
+async def select_variant_option(page: Page, option_handle: ElementHandle, attr_value: str,
+                                timeout: int = 1500) -> None:
     """
-    Generate all possible combinations of attribute values.
+    Select an attribute option and wait for the storefront to refresh the variant.
+    
+    Returns as soon as the product-attributes request completes. If no request
+    is observed within the timeout, the selection is assumed to be applied.
+    
+    Args:
+        page: Playwright page object
+        option_handle: Playwright element handle for option
+        attr_value: Value to select
+        timeout: Maximum time to wait for the variant update in milliseconds
+    """
+    try:
+        async with page.expect_response(lambda response: VARIANT_UPDATE_URL in response.url, timeout=timeout):
+            await select_attr_option(option_handle, attr_value)
+    except Error:
+        pass
+
+def get_all_combinations(*lists: List[str]) -> Iterator[Tuple[str, ...]]:
+    """
+    Lazily generate all possible combinations of attribute values.
     
     Args:
         *lists: Variable number of attribute value lists
         
     Returns:
-        List[Tuple[str, ...]]: All possible combinations
+        Iterator[Tuple[str, ...]]: All possible combinations
     """
-    return list(product(*lists))
+    return product(*lists)
 
 async def try_inventory_quantity(page: Page, check_value: int) -> bool:
     """
     Test if a specific quantity can be added to cart.
     
+    The result is read from the cart-add response of this click, which is
+    awaited from before the click, so feedback left on the page by an earlier
+    probe cannot be mistaken for it.
+    
     Args:
         page: Playwright page object
         check_value: Quantity to test
@@ -413,22 +493,16 @@ async def try_inventory_quantity(page: Page, check_value: int) -> bool:
         # Try to add to cart
         add_to_cart_button = await page.query_selector('//button[contains(@class,"add-to-cart")]')
         if add_to_cart_button:
-            await add_to_cart_button.click()
-            await page.wait_for_timeout(2000)
-            
-            # Check for error messages
-            error_selectors = [
-                '//div[contains(@class,"error")]',
-                '//div[contains(@class,"alert")]',
-                '//span[contains(text(),"not available")]'
-            ]
-            
-            for selector in error_selectors:
-                error_element = await page.query_selector(selector)
-                if error_element:
-                    return False
+            async with page.expect_response(CART_ADD_URL, timeout=3000) as response_value:
+                await add_to_cart_button.click()
+            response = await response_value.value
+            response_obj = await response.json()
             
-            return True
+            # The cart reports a rejected quantity as an error in its data
+            try:
+                return not response_obj['data'].get('error')
+            except KeyError:
+                return True
         
         return False
         
@@ -500,20 +574,25 @@ async def inventory_identifier(page: Page, primary_item: Dict[str, Any], guessed
     global data
     
     attrs_dict = await get_options_dict(page)
-    all_combinations = get_all_combinations(*(attrs_dict.values()))
+    combinations_count = prod(len(values) for values in attrs_dict.values())
+    attr_names = list(attrs_dict.keys())
+    
+    attr_handles = await page.query_selector_all('//select[contains(@class,"product-attribute-select")]')
     
-    for combination in all_combinations:
-        # Select attributes
-        attr_handles = await page.query_selector_all('//select[contains(@class,"product-attribute-select")]')
+    selected_values = [None] * len(attr_handles)
+    
+    for combination in get_all_combinations(*(attrs_dict.values())):
+        # Select attributes, skipping those already set by the previous combination
         for i, (attr_handle, value) in enumerate(zip(attr_handles, combination)):
-            await select_attr_option(attr_handle, value)
-            await page.wait_for_timeout(500)
+            if selected_values[i] != value:
+                await select_variant_option(page, attr_handle, value)
+                selected_values[i] = value
         
         # Create product variation item
-        variation_item = deepcopy(primary_item)
-        for i, (attr_name, attr_value) in enumerate(zip(attrs_dict.keys(), combination)):
-            variation_item[f'{i+1}DroplistDesc'] = attr_name
-            variation_item[f'{i+1}DroplistValue'] = attr_value
+        variation_item = primary_item.copy()
+        for (desc_key, value_key), attr_name, attr_value in zip(droplist_keys, attr_names, combination):
+            variation_item[desc_key] = attr_name
+            variation_item[value_key] = attr_value
         
         # Test inventory quantity
         inventory_quantity = await get_inventory_value(page, guessed_initial_value)
@@ -521,25 +600,9 @@ async def inventory_identifier(page: Page, primary_item: Dict[str, Any], guessed
         
         logger.info(f"Product variation: {variation_item['product_name']} - Stock: {inventory_quantity}")
         data.append(variation_item)
+        url_counts[variation_item['URL']] += 1
     
-    return len(all_combinations)
-
-def rename_columns(data_container: List[Dict[str, Any]], **cols: str) -> List[Dict[str, Any]]:
-    """
-    Rename columns in data container.
-    
-    Args:
-        data_container: List of data dictionaries
-        **cols: Column mapping (old_name=new_name)
-        
-    Returns:
-        List[Dict[str, Any]]: Data with renamed columns
-    """
-    for item in data_container:
-        for old_name, new_name in cols.items():
-            if old_name in item:
-                item[new_name] = item.pop(old_name)
-    return data_container
+    return combinations_count
 
 def remove_hyperlinks(product_item: Dict[str, Any]) -> str:
     """
@@ -554,25 +617,7 @@ def remove_hyperlinks(product_item: Dict[str, Any]) -> str:
     description = product_item.get('Description', '')
     if description:
         # Remove HTML links while keeping text
-        description = sub(r'<a[^>]*>(.*?)</a>', r'\1', description)
-    return description
-
-def reshape_description(product_item: Dict[str, Any]) -> str:
-    """
-    Reshape product description for better formatting.
-    
-    Args:
-        product_item: Product item dictionary
-        
-    Returns:
-        str: Reshaped description
-    """
-    description = product_item.get('Description', '')
-    if description:
-        # Clean up HTML and format
-        description = sub(r'<[^>]+>', '', description)  # Remove HTML tags
-        description = sub(r'\s+', ' ', description)     # Normalize whitespace
-        description = description.strip()
+        description = _RE_A.sub(r'\1', description)
     return description
 
 def standardize_data() -> Dict[str, Any]:
@@ -597,22 +642,24 @@ def standardize_data() -> Dict[str, Any]:
     
     df = pd.DataFrame(data)
     
-    # Calculate statistics
-    total_products = len(df)
-    products_with_stock = len(df[df['Current stock'] > 0])
-    products_out_of_stock = len(df[df['Current stock'] == 0])
-    total_inventory = df['Current stock'].sum()
+    # Calculate statistics from a single pass over the stock column
+    stock = df['Current stock'].to_numpy()
+    in_stock_mask = stock > 0
+    total_products = stock.size
+    products_with_stock = int(in_stock_mask.sum())
+    products_out_of_stock = total_products - products_with_stock
+    total_inventory = int(stock.sum())
     
     # Category analysis
     categories = {}
     if 'Brand' in df.columns:
-        categories = df.groupby('Brand')['Current stock'].agg(['sum', 'count']).to_dict('index')
+        categories = df.groupby('Brand', sort=False)['Current stock'].agg(['sum', 'count']).to_dict('index')
     
     # Low stock products (less than 10 items)
-    low_stock_products = df[df['Current stock'] < 10][['product_name', 'Current stock', 'Brand']].to_dict('records')
+    low_stock_products = df.loc[stock < 10, ['product_name', 'Current stock', 'Brand']].to_dict('records')
     
     # Out of stock products
-    out_of_stock_products = df[df['Current stock'] == 0][['product_name', 'Brand']].to_dict('records')
+    out_of_stock_products = df.loc[~in_stock_mask, ['product_name', 'Brand']].to_dict('records')
     
     return {
         'total_products': total_products,
@@ -648,26 +695,6 @@ def generate_report(template_name: str, data: List[Dict[str, Any]]) -> None:
     
     logger.info(f"Report generated: {report_path}")
 
-def create_hypertext() -> None:
-    """
-    Create hypertext links for the output Excel file.
-    """
-    output_folder = Path(__file__).parent.joinpath('outputs')
-    excel_path = output_folder.joinpath('output_final.xlsx')
-    
-    if excel_path.exists():
-        wb = openpyxl.load_workbook(excel_path)
-        ws = wb.active
-        
-        # Add hyperlinks to description files
-        for row in range(2, ws.max_row + 1):
-            description_path = ws.cell(row=row, column=ws.max_column).value
-            if description_path and os.path.exists(description_path):
-                ws.cell(row=row, column=ws.max_column).hyperlink = description_path
-        
-        wb.save(excel_path)
-        logger.info("Hyperlinks added to Excel file")
-
 def update_output() -> None:
     """
     Update the final output Excel file with processed data.
@@ -681,21 +708,26 @@ def update_output() -> None:
     df = pd.DataFrame(data)
     
     # Clean and reshape descriptions
-    df['Description'] = df['Description'].apply(lambda x: reshape_description({'Description': x}) if x else '')
+    df['Description'] = (
+        df['Description'].fillna('').astype(str)
+        .str.replace(_RE_TAG, '', regex=True)
+        .str.replace(_RE_WS, ' ', regex=True)
+        .str.strip()
+    )
     
     # Rename columns for better readability
-    df = rename_columns(df.to_dict('records'), 
-                       product_name='Product Name',
-                       Current_stock='Current Stock',
-                       Previous_stock='Previous Stock')
+    df = df.rename(columns={
+        'product_name': 'Product Name',
+        'Current_stock': 'Current Stock',
+        'Previous_stock': 'Previous Stock'
+    })
     
     # Export to Excel
     output_folder = Path(__file__).parent.joinpath('outputs')
     output_folder.mkdir(exist_ok=True)
     
     excel_path = output_folder.joinpath('output_final.xlsx')
-    df_export = pd.DataFrame(df)
-    df_export.to_excel(excel_path, index=False)
+    write_excel(df, excel_path)
     
     logger.info(f"Final output exported to: {excel_path}")
 
@@ -725,9 +757,11 @@ async def run(p) -> None:
     Args:
         p: Playwright instance
     """
-    global HEADLESS, PAGES_NUMBER
+    global HEADLESS, PAGES_NUMBER, _journaled_count
     
     browser = await p.chromium.launch(headless=HEADLESS)
+    # Records loaded at startup are already persisted
+    _journaled_count = len(data)
     
     # First, collect all product URLs from listing pages
     listing_tasks = [handle_listing(browser, url) for url in LISTING_URLS]
@@ -736,23 +770,28 @@ async def run(p) -> None:
     logger.info(f"Collected {len(products_urls)} product URLs")
 
     # Then process each product URL
-    product_tasks = [handle_url(browser, url) for url in products_urls]
-    await gather_with_concurrency(PAGES_NUMBER, *product_tasks)
-    
-    await browser.close()
+    try:
+        product_tasks = [handle_url(browser, url) for url in products_urls]
+        await gather_with_concurrency(PAGES_NUMBER, *product_tasks)
+    finally:
+        await checkpoint(force=True)
+        await browser.close()
 
 async def main() -> None:
     """
     Main entry point for the Black Eagle Arrows scraper.
     """
-    global logger
+    global logger, data, url_counts, PAGES_NUMBER, HEADLESS
+    
+    PAGES_NUMBER, HEADLESS = get_user_configuration()
     
     # Initialize logger
     logger = create_logger(logging.DEBUG)
     logger.info("Starting Black Eagle Arrows Inventory Scraper")
     
     # Load existing data
-    load_existing_data()
+    data = load_existing_data(logger)
+    url_counts = Counter(record.get('URL') for record in data)
     
     try:
         async with async_playwright() as p:
@@ -760,7 +799,6 @@ async def main() -> None:
         
         # Generate final outputs
         update_output()
-        create_hypertext()
         
         # Generate report
         if os.path.exists('template.txt'):
@@ -771,6 +809,9 @@ async def main() -> None:
     except Exception as e:
         logger.error(f"Scraping failed: {e}")
         raise
+    
+    finally:
+        stop_logger(logger)
 
 if __name__ == '__main__':
     asyncio.run(main())
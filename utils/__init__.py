@@ -5,21 +5,25 @@ This package contains utility modules for logging, data export, data manipulatio
 and Playwright automation.
 
 Modules:
+    - config_utils: Run configuration prompt
     - logging_utils: Logging configuration and utilities
     - export_utils: Data export and report generation
     - data_manipulation_utils: Data processing and cleaning
     - playwright_utils: Browser automation utilities
+    - state: Persisted scraping state loading
 
 Author: Project Developer
 License: MIT
 """
 
-from .logging_utils import create_logger, get_logger, set_log_level
+from .config_utils import get_user_configuration
+from .logging_utils import create_logger, get_logger, set_log_level, stop_logger
+from .state import load_existing_data, load_data_journal
 from .export_utils import (
     save_description, 
     export, 
     generate_report, 
-    create_hypertext, 
+    write_excel, 
     update_output,
     cols
 )
@@ -27,10 +31,12 @@ from .data_manipulation_utils import (
     format_date,
     clean_file_name,
     get_all_combinations,
+    count_combinations,
     rename_columns,
     standardize_data,
     validate_product_data,
-    clean_product_data
+    clean_product_data,
+    clean_product_data_bulk
 )
 from .playwright_utils import (
     check_handled_url,
@@ -44,16 +50,24 @@ from .playwright_utils import (
 )
 
 __all__ = [
+    # Configuration utilities
+    'get_user_configuration',
+    
     # Logging utilities
     'create_logger',
     'get_logger', 
     'set_log_level',
+    'stop_logger',
+    
+    # State utilities
+    'load_existing_data',
+    'load_data_journal',
     
     # Export utilities
     'save_description',
     'export',
     'generate_report',
-    'create_hypertext',
+    'write_excel',
     'update_output',
     'cols',
     
@@ -61,10 +75,12 @@ __all__ = [
     'format_date',
     'clean_file_name',
     'get_all_combinations',
+    'count_combinations',
     'rename_columns',
     'standardize_data',
     'validate_product_data',
     'clean_product_data',
+    'clean_product_data_bulk',
     
     # Playwright utilities
     'check_handled_url',
@@ -0,0 +1,31 @@
+"""
+Configuration Utilities for Black Eagle Arrows Inventory Scraper
+
+This module asks the user for the run configuration. It is shared by the
+launcher and the standalone scraper script, so neither has to import the
+other.
+
+Author: Project Developer
+License: MIT
+"""
+
+def get_user_configuration() -> tuple[int, bool]:
+    """
+    Get user configuration for the scraper.
+    
+    Returns:
+        tuple[int, bool]: (number of concurrent tabs, headless mode)
+    """
+    try:
+        pages_number = int(input('How many tabs do you want: '))
+        if pages_number <= 0:
+            print("Invalid number of tabs. Using default value of 5.")
+            pages_number = 5
+    except ValueError:
+        print("Invalid input. Using default value of 5 tabs.")
+        pages_number = 5
+    
+    headless_sign = input('Enter y if you want to see the browser and n if not: ').lower()
+    headless = headless_sign != 'y'
+    
+    return pages_number, headless
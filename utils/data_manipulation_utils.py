@@ -11,19 +11,52 @@ The module handles:
 - Data combination generation
 - Column renaming
 - Data standardization for reporting
+- Product data validation and cleaning
 
 Author: Project Developer
 License: MIT
 """
 
+from collections import namedtuple 
 from datetime import datetime 
-from re import sub 
+from re import compile 
 from itertools import product 
-from typing import List, Dict, Any, Tuple, Optional
+from math import prod 
+from typing import List, Dict, Any, Tuple, Optional, Iterator
+import pandas as pd 
 import logging
 
 # Characters to clean from file names
 name_cleaning_list = ['/', '"']
+name_cleaning_table = str.maketrans({element: ' ' for element in name_cleaning_list})
+
+# Runs of whitespace collapsed to a single space in file names
+whitespace_pattern = compile(r'\s+')
+
+# Product columns renamed for the report templates
+report_column_mapping = {
+    '1DroplistDesc': 'DroplistDesc1',
+    '1DroplistValue': 'DroplistValue1',
+    '2DroplistDesc': 'DroplistDesc2',
+    '2DroplistValue': 'DroplistValue2',
+    '3DroplistDesc': 'DroplistDesc3',
+    '3DroplistValue': 'DroplistValue3',
+    '4DroplistDesc': 'DroplistDesc4',
+    '4DroplistValue': 'DroplistValue4'
+}
+
+# Product columns exposed to the report templates, keyed by template field
+report_fields = {
+    'SKU': 'SKU',
+    'Brand': 'Brand',
+    'product_name': 'product_name',
+    'URL': 'URL',
+    'Price': 'Price',
+    **{new_key: old_key for old_key, new_key in report_column_mapping.items()}
+}
+
+# Fixed-schema report row, lighter than a renamed copy of the product dict
+ReportRow = namedtuple('ReportRow', report_fields)
 
 def format_date() -> str:
     """
@@ -60,31 +93,46 @@ def clean_file_name(name: str) -> str:
         return 'unnamed_product.html'
     
     # Replace unwanted characters with spaces
-    for element in name_cleaning_list:
-        name = name.replace(element, ' ')
+    name = name.translate(name_cleaning_table)
     
     # Normalize whitespace and add extension
-    cleaned_name = sub(r'\s+', ' ', name).strip()
+    cleaned_name = whitespace_pattern.sub(' ', name).strip()
     return f"{cleaned_name}.html"
 
-def get_all_combinations(*lists: List[str]) -> List[Tuple[str, ...]]:
+def get_all_combinations(*lists: List[str]) -> Iterator[Tuple[str, ...]]:
     """
     Generate all possible combinations of values from multiple lists.
     
-    This function uses itertools.product to generate all possible combinations
-    of attribute values for product variations.
+    This function uses itertools.product to lazily generate all possible
+    combinations of attribute values for product variations.
     
     Args:
         *lists: Variable number of lists containing attribute values
         
     Returns:
-        List[Tuple[str, ...]]: All possible combinations as tuples
+        Iterator[Tuple[str, ...]]: All possible combinations as tuples
         
     Example:
-        >>> get_all_combinations(['Red', 'Blue'], ['Small', 'Large'])
+        >>> list(get_all_combinations(['Red', 'Blue'], ['Small', 'Large']))
         [('Red', 'Small'), ('Red', 'Large'), ('Blue', 'Small'), ('Blue', 'Large')]
     """
-    return list(product(*lists))
+    return product(*lists)
+
+def count_combinations(*lists: List[str]) -> int:
+    """
+    Count the combinations get_all_combinations would generate.
+    
+    Args:
+        *lists: Variable number of lists containing attribute values
+        
+    Returns:
+        int: Number of combinations, computed without generating them
+        
+    Example:
+        >>> count_combinations(['Red', 'Blue'], ['Small', 'Medium', 'Large'])
+        6
+    """
+    return prod(map(len, lists))
 
 def rename_columns(data_container: List[Dict[str, Any]], **cols: str) -> List[Dict[str, Any]]:
     """
@@ -108,12 +156,10 @@ def rename_columns(data_container: List[Dict[str, Any]], **cols: str) -> List[Di
     result = []
     
     for item in data_container:
-        new_item = item.copy()
-        
-        for old_key, new_key in cols.items():
-            if old_key in new_item:
-                new_item[new_key] = new_item.pop(old_key)
-            else:
+        # Build the renamed dict in one pass, then fill missing targets
+        new_item = {cols.get(key, key): value for key, value in item.items()}
+        for new_key in cols.values():
+            if new_key not in new_item:
                 new_item[new_key] = ''
         
         result.append(new_item)
@@ -125,8 +171,9 @@ def standardize_data(data: List[Dict[str, Any]]) -> Dict[str, Any]:
     Standardize data for reporting by categorizing products by stock levels.
     
     This function processes the scraped data and organizes it into categories
-    based on current stock levels. It also renames columns for consistency
-    in reporting templates.
+    based on current stock levels. Each product becomes a ReportRow holding
+    only the fields used by the reporting templates, with the droplist
+    columns renamed for consistency.
     
     Args:
         data: List of dictionaries containing product data
@@ -150,46 +197,36 @@ def standardize_data(data: List[Dict[str, Any]]) -> Dict[str, Any]:
             }
         }
     
-    # Column mapping for standardization
-    column_mapping = {
-        '1DroplistDesc': 'DroplistDesc1',
-        '1DroplistValue': 'DroplistValue1',
-        '2DroplistDesc': 'DroplistDesc2',
-        '2DroplistValue': 'DroplistValue2',
-        '3DroplistDesc': 'DroplistDesc3',
-        '3DroplistValue': 'DroplistValue3',
-        '4DroplistDesc': 'DroplistDesc4',
-        '4DroplistValue': 'DroplistValue4'
-    }
-    
-    # Categorize products by stock levels
-    out_of_stock = [
-        product_item for product_item in data 
-        if product_item.get('Current stock', 0) == 0
-    ]
+    # Categorize products by stock levels in a single pass, building one row
+    # per product and sharing it between overlapping buckets
+    out_of_stock = []
+    in_stock = []
+    more_than_5_stock = []
+    only_1_stock = []
     
-    in_stock = [
-        product_item for product_item in data 
-        if product_item.get('Current stock', 0) > 0
-    ]
-    
-    more_than_5_stock = [
-        product_item for product_item in data 
-        if product_item.get('Current stock', 0) > 5
-    ]
-    
-    only_1_stock = [
-        product_item for product_item in data 
-        if product_item.get('Current stock', 0) == 1
-    ]
+    for product_item in data:
+        stock = product_item.get('Current stock', 0)
+        if stock < 0:
+            continue
+        
+        row = ReportRow._make(product_item.get(old_key, '') for old_key in report_fields.values())
+        
+        if stock == 0:
+            out_of_stock.append(row)
+        else:
+            in_stock.append(row)
+            if stock > 5:
+                more_than_5_stock.append(row)
+            elif stock == 1:
+                only_1_stock.append(row)
     
     # Standardize data structure
     standard_data = {
         'data': {
-            'out_of_stocks_products': rename_columns(out_of_stock, **column_mapping),
-            'in_stocks_products': rename_columns(in_stock, **column_mapping),
-            'more_5_stocks_products': rename_columns(more_than_5_stock, **column_mapping),
-            'only_1_stocks_products': rename_columns(only_1_stock, **column_mapping)
+            'out_of_stocks_products': out_of_stock,
+            'in_stocks_products': in_stock,
+            'more_5_stocks_products': more_than_5_stock,
+            'only_1_stocks_products': only_1_stock
         }
     }
     
@@ -218,7 +255,7 @@ def validate_product_data(product_item: Dict[str, Any]) -> bool:
     
     for field in required_fields:
         if field not in product_item:
-            logging.warning(f"Missing required field: {field}")
+            logging.warning("Missing required field: %s", field)
             return False
     
     return True
@@ -255,3 +292,30 @@ def clean_product_data(product_item: Dict[str, Any]) -> Dict[str, Any]:
     
     return cleaned_item
 
+def clean_product_data_bulk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean and normalize a whole table of product data.
+    
+    This is the vectorized counterpart of clean_product_data: stock columns
+    are parsed with pd.to_numeric, unparsable values become 0, and string
+    values are stripped column by column.
+    
+    Args:
+        df: Product data, one row per product variation
+        
+    Returns:
+        pd.DataFrame: Cleaned copy of the product data
+    """
+    cleaned_df = df.copy()
+    
+    # Ensure numeric fields are properly typed
+    for column in ('Current stock', 'Previous stock'):
+        if column in cleaned_df.columns:
+            cleaned_df[column] = pd.to_numeric(cleaned_df[column], errors='coerce').fillna(0).astype('int32')
+    
+    # Clean string fields, leaving non-string values untouched
+    for column in cleaned_df.select_dtypes(include='object').columns:
+        cleaned_df[column] = cleaned_df[column].str.strip().fillna(cleaned_df[column])
+    
+    return cleaned_df
+
@@ -9,51 +9,54 @@ The module includes functions for:
 - Saving product descriptions to HTML files
 - Exporting data to CSV format
 - Generating HTML reports using Jinja2 templates
-- Creating hyperlinks in Excel files
+- Writing Excel files with hyperlinks to the description files
 - Updating output files with previous stock information
 
 Author: Project Developer
 License: MIT
 """
 
-from parsel import Selector 
 from pathlib import Path 
 from jinja2 import Environment, FileSystemLoader
-from datetime import datetime 
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.hyperlink import Hyperlink
+from datetime import datetime 
 from utils.data_manipulation_utils import (
     standardize_data,
-    clean_file_name
+    clean_file_name,
+    clean_product_data_bulk
 )
+from utils.state import cols
 import pandas as pd 
 import openpyxl 
 import logging 
 from typing import List, Dict, Any, Optional
 import os
+import csv
+
+# Project root, resolved once at import
+root_dir = Path(__file__).resolve().parents[1]
 
-# Columns that uniquely identify a production variation
-cols = [
-    'SKU',
-    '1DroplistDesc',
-    '1DroplistValue',
-    '2DroplistDesc',
-    '2DroplistValue',
-    '3DroplistDesc',
-    '3DroplistValue',
-    '4DroplistDesc',
-    '4DroplistValue'
-]
+# Output folders, created once at import instead of on every call
+descriptions_dir = root_dir.joinpath('descriptions')
+outputs_dir = root_dir.joinpath('outputs')
+reports_dir = root_dir.joinpath('reports')
+for folder in (descriptions_dir, outputs_dir, reports_dir):
+    folder.mkdir(exist_ok=True)
 
-def save_description(selector: Selector, product_item: Dict[str, Any]) -> str:
+# Report templates environment, compiled templates are reused across reports
+jinja_env = Environment(loader=FileSystemLoader('.'), auto_reload=False, cache_size=50)
+
+def save_description(product_item: Dict[str, Any]) -> str:
     """
     Save product description to HTML file.
     
-    This function extracts the product description from the page and saves it
+    This function saves the product description HTML held in the product item
     as an HTML file in the descriptions directory. The filename is cleaned
     to remove invalid characters.
     
     Args:
-        selector: Parsel selector object containing the page content
         product_item: Dictionary containing product information including name
         
     Returns:
@@ -63,10 +66,7 @@ def save_description(selector: Selector, product_item: Dict[str, Any]) -> str:
         Exception: If there's an error writing the file
     """
     try:
-        description_folder = Path(__file__).parents[1].joinpath('descriptions')
-        description_folder.mkdir(exist_ok=True)
-        
-        description_path = description_folder.joinpath(clean_file_name(product_item['product_name']))
+        description_path = descriptions_dir.joinpath(clean_file_name(product_item['product_name']))
         description_content = product_item.get('Description', '')
         with open(description_path, 'w', encoding='utf-8') as file:
             file.write(description_content)
@@ -74,7 +74,7 @@ def save_description(selector: Selector, product_item: Dict[str, Any]) -> str:
         return str(description_path.absolute())
         
     except Exception as e:
-        logging.error(f"Error saving description for {product_item.get('product_name', 'Unknown')}: {e}")
+        logging.error("Error saving description for %s: %s", product_item.get('product_name', 'Unknown'), e)
         raise
 
 def export(data: List[Dict[str, Any]]) -> None:
@@ -82,7 +82,8 @@ def export(data: List[Dict[str, Any]]) -> None:
     Export the extracted data to CSV file.
     
     This function saves the scraped data to a CSV file in the outputs directory.
-    The data is converted to a pandas DataFrame before export.
+    Rows are streamed with csv.DictWriter; the header is the union of the record
+    keys in first-seen order.
     
     Args:
         data: List of dictionaries containing scraped product data
@@ -91,17 +92,17 @@ def export(data: List[Dict[str, Any]]) -> None:
         Exception: If there's an error writing the CSV file
     """
     try:
-        output_folder = Path(__file__).parents[1].joinpath('outputs')
-        output_folder.mkdir(exist_ok=True)
+        output_path = outputs_dir.joinpath('output.csv')
+        fieldnames = list(dict.fromkeys(key for row in data for key in row))
+        with open(output_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames, restval='', lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(data)
         
-        df = pd.DataFrame(data)
-        output_path = output_folder.joinpath('output.csv')
-        df.to_csv(output_path, index=False)
-        
-        logging.info(f"Exported {len(data)} records to {output_path}")
+        logging.info("Exported %d records to %s", len(data), output_path)
         
     except Exception as e:
-        logging.error(f"Error exporting data to CSV: {e}")
+        logging.error("Error exporting data to CSV: %s", e)
         raise
 
 def generate_report(template_name: str, data: List[Dict[str, Any]], logger: logging.RootLogger) -> None:
@@ -123,19 +124,11 @@ def generate_report(template_name: str, data: List[Dict[str, Any]], logger: logg
     try:
         logger.info('Generating reports...')
         
-        # Create reports directory
-        reports_dir = Path(__file__).parents[1].joinpath('reports')
-        reports_dir.mkdir(exist_ok=True)
-        
-        # Set up Jinja2 environment
-        env = Environment(loader=FileSystemLoader('.'))
-        
         # Load template
         if not os.path.exists(template_name):
-            logger.warning(f"Template file {template_name} not found, using default template")
-            template = env.get_template('template.txt')
-        else:
-            template = env.get_template(template_name)
+            logger.warning("Template file %s not found, using default template", template_name)
+            template_name = 'template.txt'
+        template = jinja_env.get_template(template_name)
         
         # Standardize data for reporting
         standardized_data = standardize_data(data)
@@ -144,63 +137,101 @@ def generate_report(template_name: str, data: List[Dict[str, Any]], logger: logg
         rendered_report = template.render(standardized_data)
         
         # Save report with timestamp
-        timestamp = str(datetime.now()).replace(":", "-").replace(" ", "_")
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S.%f")
         report_path = reports_dir.joinpath(f'report_{timestamp}.txt')
         
         with open(report_path, 'w', encoding='utf-8') as file:
             file.write(rendered_report)
         
-        logger.info(f"Report generated: {report_path}")
+        logger.info("Report generated: %s", report_path)
         
     except FileNotFoundError as e:
-        logger.error(f"Template file not found: {e}")
+        logger.error("Template file not found: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Error generating report: {e}")
+        logger.error("Error generating report: %s", e)
         raise
 
-def create_hypertext() -> None:
+def list_directory(directory: str, listings: Dict[str, set]) -> set:
+    """
+    Return the entry names of a directory, scanning it at most once.
+    
+    Args:
+        directory: Directory to list
+        listings: Cache of directory listings, keyed by directory
+        
+    Returns:
+        set: Names of the directory entries, empty if it cannot be read
+    """
+    if directory not in listings:
+        try:
+            with os.scandir(directory or '.') as entries:
+                listings[directory] = {entry.name for entry in entries}
+        except OSError:
+            listings[directory] = set()
+    return listings[directory]
+
+def write_excel(df: pd.DataFrame, excel_path: Path) -> None:
     """
-    Create hyperlinks in the Excel output file.
+    Write a DataFrame to an Excel file with hyperlinks to the description files.
     
-    This function adds hyperlinks to the description files in the Excel output.
-    It reads the Excel file and adds hyperlinks to the description column.
+    Rows are streamed with an openpyxl write-only workbook, which does not keep
+    a cell object per value in memory, and each existing description file path
+    is written as a hyperlink in the same pass. Existence is checked against
+    one directory listing per parent folder instead of a stat per row.
     
-    Raises:
-        FileNotFoundError: If the Excel file doesn't exist
-        Exception: If there's an error processing the Excel file
+    Args:
+        df: Data to write, with column names as the header row
+        excel_path: Path of the Excel file to create
     """
-    try:
-        excel_path = Path(__file__).parents[1].joinpath('outputs', 'output_final.xlsx')
-        
-        if not excel_path.exists():
-            logging.warning("Excel file not found, skipping hyperlink creation")
-            return
-        
-        workbook = openpyxl.load_workbook(str(excel_path))
-        sheet = workbook.active
-        
-        # Add hyperlinks to description column (column R)
-        for index, cell in enumerate(sheet['R'], start=1):
-            if index == 1:  # Skip header row
-                continue
-            
-            if cell.value and os.path.exists(str(cell.value)):
-                cell.hyperlink = Hyperlink(
-                    ref=f'R{index}',
-                    target=str(cell.value),
-                    display=str(cell.value)
-                )
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(list(df.columns))
+    
+    link_column = df.columns.get_loc('Description_path') if 'Description_path' in df.columns else None
+    link_letter = get_column_letter(link_column + 1) if link_column is not None else None
+    
+    listings: Dict[str, set] = {}
+    
+    for row_index, row in enumerate(df.fillna('').itertuples(index=False, name=None), start=2):
+        if link_column is None or not row[link_column]:
+            sheet.append(row)
+            continue
         
-        workbook.save(str(excel_path))
-        logging.info("Hyperlinks added to Excel file")
+        description_path = str(row[link_column])
+        directory, name = os.path.split(description_path)
+        if name in list_directory(directory, listings):
+            cell = WriteOnlyCell(sheet, value=description_path)
+            cell._hyperlink = Hyperlink(
+                ref=f'{link_letter}{row_index}',
+                target=description_path,
+                display=description_path
+            )
+            row = row[:link_column] + (cell,) + row[link_column + 1:]
+        sheet.append(row)
+    
+    workbook.save(str(excel_path))
+
+def read_excel(excel_path: Path) -> pd.DataFrame:
+    """
+    Read the first sheet of an Excel file into a DataFrame.
+    
+    The workbook is opened in read-only mode, which streams rows instead of
+    building a cell object for every value.
+    
+    Args:
+        excel_path: Path of the Excel file to read
         
-    except FileNotFoundError as e:
-        logging.error(f"Excel file not found: {e}")
-        raise
-    except Exception as e:
-        logging.error(f"Error creating hyperlinks: {e}")
-        raise
+    Returns:
+        pd.DataFrame: Sheet content with the first row as header and empty cells as ''
+    """
+    workbook = openpyxl.load_workbook(str(excel_path), read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, ())
+        return pd.DataFrame(rows, columns=header).fillna('')
+    finally:
+        workbook.close()
 
 def update_output(data: List[Dict[str, Any]]) -> None:
     """
@@ -217,65 +248,45 @@ def update_output(data: List[Dict[str, Any]]) -> None:
         Exception: If there's an error processing the data
     """
     try:
-        output_dir = Path(__file__).parents[1].joinpath('outputs')
-        output_dir.mkdir(exist_ok=True)
-        
-        excel_path = output_dir.joinpath('output_final.xlsx')
-        csv_path = output_dir.joinpath('output.csv')
+        excel_path = outputs_dir.joinpath('output_final.xlsx')
         
         # Check if previous Excel file exists
-        if excel_path.exists() and csv_path.exists():
+        if excel_path.exists() and data:
             try:
                 # Load existing data
-                old_df = pd.read_excel(str(excel_path), index_col=False).fillna('')
-                new_df = pd.read_csv(str(csv_path), index_col=False).fillna('')
+                old_df = read_excel(excel_path)
+                new_df = clean_product_data_bulk(pd.DataFrame(data).fillna(''))
                 
-                # Update previous stock information
-                for index, row in new_df.iterrows():
-                    try:
-                        # Find matching record in old data
-                        mask = (
-                            (old_df['SKU'] == row['SKU']) &
-                            (old_df['1DroplistDesc'] == row['1DroplistDesc']) &
-                            (old_df['1DroplistValue'] == row['1DroplistValue']) &
-                            (old_df['2DroplistDesc'] == row['2DroplistDesc']) &
-                            (old_df['2DroplistValue'] == row['2DroplistValue']) &
-                            (old_df['3DroplistDesc'] == row['3DroplistDesc']) &
-                            (old_df['3DroplistValue'] == row['3DroplistValue']) &
-                            (old_df['4DroplistDesc'] == row['4DroplistDesc']) &
-                            (old_df['4DroplistValue'] == row['4DroplistValue'])
-                        )
-                        
-                        matching_stock = old_df[mask]['Current stock'].values
-                        if len(matching_stock) > 0:
-                            new_df.loc[index, 'Previous stock'] = matching_stock[0]
-                            
-                    except (IndexError, KeyError):
-                        # No matching record found, keep default value
-                        pass
-                    
-                    new_df.loc[index, 'Previous stock date'] = str(datetime.now())
+                # Remove duplicates before matching so they are not looked up
+                new_df = new_df.drop_duplicates(subset=cols, keep='last').reset_index(drop=True)
                 
-                # Remove duplicates and save
-                new_df.drop_duplicates(
-                    subset=cols,
-                    keep='last',
-                    inplace=True
-                )
+                # Update previous stock information: group the old stock by the
+                # variation columns (the first old match wins) and map the new
+                # keys onto it
+                old_keys = old_df[cols].astype(str)
+                previous_stock = old_df['Current stock'].groupby(
+                    [old_keys[col] for col in cols],
+                    sort=False
+                ).first()
+                new_keys = pd.MultiIndex.from_frame(new_df[cols].astype(str))
+                previous = pd.Series(new_keys.map(previous_stock), index=new_df.index)
+                matched = previous.notna()
+                new_df.loc[matched, 'Previous stock'] = previous[matched]
+                new_df['Previous stock date'] = str(datetime.now())
                 
-                new_df.to_excel(str(excel_path), index=False)
-                logging.info(f"Updated Excel file with {len(new_df)} records")
+                write_excel(new_df, excel_path)
+                logging.info("Updated Excel file with %d records", len(new_df))
                 
             except Exception as e:
-                logging.error(f"Error updating existing Excel file: {e}")
+                logging.error("Error updating existing Excel file: %s", e)
                 # Fallback to creating new file
-                pd.DataFrame(data).to_excel(str(excel_path), index=False)
+                write_excel(clean_product_data_bulk(pd.DataFrame(data)), excel_path)
                 
         else:
             # Create new Excel file
-            pd.DataFrame(data).to_excel(str(excel_path), index=False)
-            logging.info(f"Created new Excel file with {len(data)} records")
+            write_excel(clean_product_data_bulk(pd.DataFrame(data)), excel_path)
+            logging.info("Created new Excel file with %d records", len(data))
             
     except Exception as e:
-        logging.error(f"Error updating output: {e}")
+        logging.error("Error updating output: %s", e)
         raise
\ No newline at end of file
@@ -5,15 +5,28 @@ This module provides logging functionality for the Black Eagle Arrows inventory
 It creates and configures loggers with both console and file handlers for comprehensive
 logging throughout the application.
 
+Records are handed to a queue and written by a background listener thread, so
+logging calls from the scraping loop never wait on console or disk I/O.
+
 Author: Project Developer
 License: MIT
 """
 
 from pathlib import Path 
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
 import logging 
 from datetime import datetime 
+import atexit
 import sys
-from typing import Optional
+from typing import Dict, Optional
+
+# Log files folder, resolved and created once at import
+logs_dir = Path(__file__).resolve().parents[1].joinpath('logs')
+logs_dir.mkdir(exist_ok=True)
+
+# Running queue listeners, keyed by logger name
+listeners: Dict[str, QueueListener] = {}
 
 
 def create_logger(logging_level: int, log_name: Optional[str] = None) -> logging.RootLogger:
@@ -22,7 +35,10 @@ def create_logger(logging_level: int, log_name: Optional[str] = None) -> logging
     
     This function sets up a logger that writes to both the console and a timestamped
     log file. The log file is created in the 'logs' directory with a timestamp
-    to avoid conflicts between different runs.
+    to avoid conflicts between different runs, and is only opened when the
+    first record is written. The logger itself only enqueues records; a
+    QueueListener owns the real handlers and is stopped by stop_logger or
+    at interpreter exit.
     
     Args:
         logging_level: Logging level (e.g., logging.DEBUG, logging.INFO, logging.WARNING)
@@ -35,16 +51,13 @@ def create_logger(logging_level: int, log_name: Optional[str] = None) -> logging
         >>> logger = create_logger(logging.DEBUG)
         >>> logger.info("Application started")
     """
-    # Create logs directory if it doesn't exist
-    logs_dir = Path(__file__).parents[1].joinpath('logs')
-    logs_dir.mkdir(exist_ok=True)
-    
     # Create logger
     logger_name = log_name or __name__
     logger = logging.getLogger(logger_name)
     logger.setLevel(logging_level)
     
     # Clear any existing handlers to avoid duplicates
+    stop_logger(logger)
     logger.handlers.clear()
     
     # Create formatter
@@ -53,18 +66,49 @@ def create_logger(logging_level: int, log_name: Optional[str] = None) -> logging
     # Console handler
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
     
     # File handler with timestamp
-    timestamp = str(datetime.now()).replace(":", "-").replace(" ", "_")
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S.%f")
     log_file_path = logs_dir.joinpath(f'logs_{timestamp}.log')
-    file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
+    file_handler = logging.FileHandler(log_file_path, encoding='utf-8', delay=True)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    # Hand records to a background listener that owns the real handlers
+    log_queue = Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    listeners[logger.name] = listener
     
     return logger
 
 
+def stop_logger(logger: logging.Logger) -> None:
+    """
+    Flush pending records and stop the queue listener of a logger.
+    
+    Calling it again, or for a logger without a listener, does nothing.
+    
+    Args:
+        logger: Logger created by create_logger
+    """
+    listener = listeners.pop(logger.name, None)
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+@atexit.register
+def stop_all_loggers() -> None:
+    """
+    Stop every running queue listener so no record is lost at exit.
+    """
+    for name in list(listeners):
+        stop_logger(logging.getLogger(name))
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Get an existing logger or create a new one with default settings.
@@ -87,5 +131,7 @@ def set_log_level(logger: logging.Logger, level: int) -> None:
         level: New logging level
     """
     logger.setLevel(level)
-    for handler in logger.handlers:
+    listener = listeners.get(logger.name)
+    handlers = list(logger.handlers) + list(listener.handlers if listener else ())
+    for handler in handlers:
         handler.setLevel(level)
\ No newline at end of file
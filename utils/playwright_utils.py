@@ -21,23 +21,33 @@ from playwright.async_api._generated import Browser
 from playwright.async_api._generated import BrowserContext
 from playwright.async_api._generated import Page
 from playwright.async_api._generated import ElementHandle
-from parsel import Selector 
-from typing import List, Dict, Any, Set, Optional, Tuple
-from copy import deepcopy 
+from playwright.async_api._generated import Route
+from lxml import html as lxml_html
+from lxml.etree import XPath, tostring
+from typing import List, Dict, Any, Set, Optional, Tuple, Iterator, Sequence
+from collections import Counter
+from itertools import islice
 from json.decoder import JSONDecodeError
 from re import compile 
 from utils.data_manipulation_utils import (
     get_all_combinations,
+    count_combinations,
     format_date,
 )
+from utils.state import (
+    droplist_keys,
+    append_data_journal,
+    save_data,
+    load_products_urls,
+    save_products_urls,
+    append_products_urls
+)
 from utils.export_utils import (
     save_description,
     export,
     update_output,
-    create_hypertext,
     generate_report
 )
-import pickle 
 import asyncio 
 import os 
 import logging
@@ -50,85 +60,191 @@ listing_urls = [
     'https://blackeaglearrows.com/gear/'
 ]
 
-async def handle_help_us_stay_connected_popup(page:Page) :
-    if await page.query_selector('//button[contains(@class,"needsclick")]'):
-        await page.click('//button[contains(@class,"needsclick")]')
+# Precompiled XPath expressions used for extraction
+pagination_xpath = XPath('//a[contains(@class,"listing-pagination-link")]')
+product_links_xpath = XPath('//a[@class="card-figure__link"]/@href', smart_strings=False)
+number_pattern = compile(r'\d+')
+
+# Collects every product page field in the browser with a single round trip
+product_fields_script = """() => {
+    const evaluate = (expression, type) => document.evaluate(expression, document, null, type, null);
+    const text = (expression) => evaluate(`string(${expression})`, XPathResult.STRING_TYPE).stringValue;
+    const first = (expression) => {
+        const node = evaluate(expression, XPathResult.FIRST_ORDERED_NODE_TYPE).singleNodeValue;
+        return node ? node.nodeValue : null;
+    };
+    const description = document.getElementById('tab-description');
+    return {
+        sku: text('//dt[@class="productView-info-name sku-label"]/following-sibling::dd[1]'),
+        brand: text('//h2[@class="productView-brand"]'),
+        product_name: first('//h1/text()'),
+        price: text('(//span[@class="price price--withoutTax"])[1]'),
+        image: first('//figure[@class="productView-image"]/@data-zoom-image'),
+        description: description ? description.outerHTML : ''
+    };
+}"""
+
+# Maximum number of pagination pages fetched at once for a listing
+listing_pages_concurrency = 5
+
+# Resource types the scraper never needs; stylesheets are kept because the
+# cart modal buttons rely on them for visibility checks
+blocked_resource_types = {'image', 'font', 'media'}
+
+# Default timeouts in milliseconds for navigations and for every other operation
+navigation_timeout = 10000
+action_timeout = 2000
+
+# Minimum wall-clock budget in seconds for identifying the inventory of one
+# product URL, and the extra seconds granted per variation on each tab
+url_time_budget = 180
+variation_time_budget = 20
+
+# Chromium switches for a headless scraping browser
+browser_args = ['--disable-gpu', '--disable-extensions', '--disable-dev-shm-usage']
+
+# Storefront endpoint refreshed whenever a product option changes
+variant_update_url = '/remote/v1/product-attributes/'
+
+# Cart endpoint answering every add-to-cart click
+cart_add_url = '**/remote/v1/cart/add'
+
+# Add-to-cart click retries before a probe gives up, with exponential backoff
+cart_add_retries = 2
+
+# Time in milliseconds allowed for an add-to-cart click and its cart response
+cart_add_timeout = 4000
+
+# Close button of the "help us stay connected" popup
+popup_close_xpath = '//button[contains(@class,"needsclick")]'
+
+# Product option selects on a product page
+attribute_selects_xpath = '//select[contains(@name,"attribute")]'
+
+# Collects the non-empty option values of every option select in one round trip
+option_values_script = """() => Array.from(
+    document.querySelectorAll('select[name*="attribute"]'),
+    (select) => Array.from(select.options, (option) => option.value).filter(Boolean)
+)"""
+
+# Reads the label text of an option select, up to the colon
+select_label_script = """(select) => {
+    let label = null;
+    for (let node = select.previousElementSibling; node; node = node.previousElementSibling) {
+        if (node.tagName === 'LABEL') {
+            label = node;
+        }
+    }
+    return label ? label.innerText.split(':')[0] : '';
+}"""
+
+# Maximum number of tabs probing the variations of one product at once
+variation_pages = 3
+
+# Number of handled URLs between full data.json checkpoints
+checkpoint_every = 50
 
-async def check_handled_url(page: Page, data: List[Dict[str, Any]]) -> bool:
+# Append-only log of product URLs that failed to scrape, one per line
+failed_urls_path = 'failed_urls.log'
+
+_checkpoint_lock: Optional[asyncio.Lock] = None
+_journaled_count = 0
+_handled_since_checkpoint = 0
+
+async def handle_help_us_stay_connected_popup(page: Page) -> None:
     """
-    Check if the URL has been processed before by comparing product combinations.
+    Register a handler dismissing the "help us stay connected" popup.
+    
+    The handler runs only when the popup blocks an action, so pages do not
+    query for it after every navigation.
     
     Args:
         page: Playwright page object
-        data: List of existing product data
+    """
+    popup_button = page.locator(popup_close_xpath).first
+    await page.add_locator_handler(popup_button, lambda: popup_button.click())
+
+def check_handled_url(url: str, attrs_dict: Dict[ElementHandle, List[str]],
+                      url_counts: Counter[str]) -> bool:
+    """
+    Check if the URL has been processed before by comparing product combinations.
+    
+    Args:
+        url: Product URL
+        attrs_dict: Option selects of the product page and their values
+        url_counts: Number of scraped variations per product URL
         
     Returns:
         bool: True if URL has been handled, False otherwise
     """
-    attrs_dict = await get_options_dict(page)
-    all_combinations = get_all_combinations(*(attrs_dict.values()))
-    return len(list(all_combinations)) == len([item['product_name'] == page.url for item in data])
+    handled = url_counts.get(url, 0)
+    if not handled:
+        return False
+    return handled >= count_combinations(*attrs_dict.values())
 
-async def get_total_pages(page: Page) -> int:
+async def snapshot(page: Page) -> lxml_html.HtmlElement:
     """
-    Get the total number of pages for a listing page.
+    Serialize the page DOM once and parse it with lxml.
     
     Args:
         page: Playwright page object
         
     Returns:
-        int: Total number of pages, defaults to 1 if pagination not found
+        lxml_html.HtmlElement: Parsed page, shared by the extraction helpers
     """
-    selector = Selector(text=await page.content())
-    try:
-        pagination_numbers = selector.xpath('//a[contains(@class,"listing-pagination-link")]').re(r'\d+')
-        return max([int(number) for number in pagination_numbers]) if pagination_numbers else 1
-    except ValueError:
-        return 1
+    return lxml_html.fromstring(await page.content())
 
-async def get_page_products_urls(page: Page) -> List[str]:
+def get_total_pages(tree: lxml_html.HtmlElement) -> int:
     """
-    Extract all product URLs from a listing page.
+    Get the total number of pages for a listing page.
     
     Args:
-        page: Playwright page object
+        tree: Parsed listing page
         
     Returns:
-        List[str]: List of product URLs found on the page
+        int: Total number of pages, defaults to 1 if pagination not found
     """
-    selector = Selector(text=await page.content())
-    return selector.xpath('//a[@class="card-figure__link"]/@href').getall()
+    try:
+        pagination_numbers = [
+            number
+            for link in pagination_xpath(tree)
+            for number in number_pattern.findall(tostring(link, encoding='unicode', with_tail=False))
+        ]
+        return max([int(number) for number in pagination_numbers]) if pagination_numbers else 1
+    except ValueError:
+        return 1
 
-async def get_description_outer_html(page:Page) -> str:
+def get_page_products_urls(tree: lxml_html.HtmlElement) -> List[str]:
     """
-    Extract the outer HTML of the product description section.
+    Extract all product URLs from a listing page.
     
     Args:
-        page: Playwright page object
+        tree: Parsed listing page
         
     Returns:
-        str: Outer HTML of the description section
+        List[str]: List of product URLs found on the page
     """
-    desc_handle = await page.query_selector('//*[@id="tab-description"]')
-    return await desc_handle.evaluate('(element) => element.outerHTML') if desc_handle else ''
+    return product_links_xpath(tree)
 
 async def get_product_item(page: Page) -> Dict[str, Any]:
     """
     Extract initial product information from a product page.
     
+    All fields, including the description HTML, are read in the browser by a
+    single evaluate call instead of serializing and re-parsing the whole page.
+    
     Args:
         page: Playwright page object
-        data: List of existing product data
         
     Returns:
         Dict[str, Any]: Dictionary containing product information
     """
-    selector = Selector(text=await page.content())
+    fields = await page.evaluate(product_fields_script)
     
     product_item = {
-        'SKU': selector.xpath('string(//dt[@class="productView-info-name sku-label"]/following-sibling::dd[1])').get().strip(),
-        'Brand': selector.xpath('string(//h2[@class="productView-brand"])').get().strip(),
-        'product_name': selector.xpath('//h1/text()').get(),
+        'SKU': fields['sku'].strip(),
+        'Brand': fields['brand'].strip(),
+        'product_name': fields['product_name'],
         'URL': page.url,
         '1DroplistDesc': '',
         '1DroplistValue': '',
@@ -138,44 +254,148 @@ async def get_product_item(page: Page) -> Dict[str, Any]:
         '3DroplistValue': '',
         '4DroplistDesc': '',
         '4DroplistValue': '',
-        'Price': selector.xpath('string((//span[@class="price price--withoutTax"])[1])').get().strip(),
+        'Price': fields['price'].strip(),
         'Current stock': 0,
         'Current stock date': format_date(),
         'Previous stock': 0,
         'Previous stock date': '',
         'Description_path': '',
-        'Description': '',
-        'Item photo URL': selector.xpath('//figure[@class="productView-image"]/@data-zoom-image').get()
+        'Description': fields['description'],
+        'Item photo URL': fields['image']
     }
     
     # Save description and update paths
-    product_item['Description'] = await get_description_outer_html(page)
-    product_item['Description_path'] = save_description(selector, product_item)
+    product_item['Description_path'] = await asyncio.to_thread(save_description, product_item)
     return product_item
 
-async def handle_url(browser: Browser, url: str, logger: logging.RootLogger, 
-                    data: List[Dict[str, Any]], failed_urls: Set[str]) -> None:
+async def block_heavy_resources(route: Route) -> None:
     """
-    Handle the extraction logic for a single product URL.
+    Abort requests for resources that are not needed for scraping.
+    
+    Image URLs are read from the HTML attributes, so the image bytes are never used.
+    
+    Args:
+        route: Playwright route for the intercepted request
+    """
+    if route.request.resource_type in blocked_resource_types:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def create_page_pool(browser: Browser, size: int) -> asyncio.Queue:
+    """
+    Create a pool of long-lived pages, each in its own browser context.
+    
+    Every pooled entry is a list of variation_pages pages: the page handling
+    the product URL first, then the sibling pages probing its variations.
+    Each page has its own context, and so its own cart.
     
     Args:
         browser: Playwright browser instance
+        size: Number of entries in the pool
+        
+    Returns:
+        asyncio.Queue: Queue holding the pooled page lists
+    """
+    page_queue = asyncio.Queue()
+    for _ in range(size):
+        pages = []
+        for _ in range(variation_pages):
+            context = await create_scraping_context(browser)
+            pages.append(await open_pool_page(context))
+        page_queue.put_nowait(pages)
+    return page_queue
+
+async def open_pool_page(context: BrowserContext) -> Page:
+    """
+    Open a page in a pooled context with the popup handler registered.
+    
+    Args:
+        context: Pooled browser context
+        
+    Returns:
+        Page: New page of the context
+    """
+    page = await context.new_page()
+    await handle_help_us_stay_connected_popup(page)
+    return page
+
+async def create_scraping_context(browser: Browser) -> BrowserContext:
+    """
+    Create a long-lived browser context with the scraper defaults applied.
+    
+    Args:
+        browser: Playwright browser instance
+        
+    Returns:
+        BrowserContext: Context with the default navigation and action
+        timeouts set and heavy resources blocked
+    """
+    context = await browser.new_context()
+    context.set_default_navigation_timeout(navigation_timeout)
+    context.set_default_timeout(action_timeout)
+    await context.route('**/*', block_heavy_resources)
+    return context
+
+async def close_page_pool(page_queue: asyncio.Queue) -> None:
+    """
+    Close every pooled page and its browser context.
+    
+    Args:
+        page_queue: Queue holding the pooled page lists
+    """
+    while not page_queue.empty():
+        for page in page_queue.get_nowait():
+            await page.context.close()
+
+def get_url_time_budget(attrs_dict: Dict[ElementHandle, List[str]]) -> float:
+    """
+    Get the time budget for identifying the inventory of one product URL.
+    
+    The budget grows with the number of variations each tab has to probe,
+    so large products can finish instead of timing out on every run.
+    
+    Args:
+        attrs_dict: Option selects of the product page and their values
+        
+    Returns:
+        float: Time budget in seconds
+    """
+    per_tab = count_combinations(*attrs_dict.values()) / variation_pages
+    return max(url_time_budget, per_tab * variation_time_budget)
+
+async def handle_url(page_queue: asyncio.Queue, url: str, logger: logging.RootLogger, 
+                    data: List[Dict[str, Any]], failed_urls: Set[str],
+                    url_counts: Counter[str]) -> None:
+    """
+    Handle the extraction logic for a single product URL.
+    
+    A page list is borrowed from the pool for the duration of the call. The
+    cookies of every page are cleared before it is returned so every product
+    starts with empty carts.
+    
+    Args:
+        page_queue: Queue holding the pooled page lists
         url: Product URL to process
         logger: Logger instance
         data: List of existing product data
         failed_urls: Set of failed URLs
+        url_counts: Number of scraped variations per product URL
     """
-    context = await browser.new_context()
-    context.set_default_timeout(5000)
-    page = await context.new_page()
+    pages = await page_queue.get()
+    for i, pooled_page in enumerate(pages):
+        if pooled_page.is_closed():
+            pages[i] = await open_pool_page(pooled_page.context)
+    page = pages[0]
     
     try:
         await page.goto(url)
+        attrs_dict = await get_options_dict(page)
         
-        if await check_handled_url(page, data):
+        if check_handled_url(page.url, attrs_dict, url_counts):
             logger.info(f"URL already handled: {url}")
+            await clear_failed_url(url, failed_urls)
             return
-        await handle_help_us_stay_connected_popup(page)
         primary_item = await get_product_item(page)
         
         # Check if product is unavailable
@@ -184,122 +404,282 @@ async def handle_url(browser: Browser, url: str, logger: logging.RootLogger,
             logger.info('No adding cart button available')
             logger.info(f'Item scraped: {primary_item["product_name"]}')
             data.append(primary_item)
+            url_counts[primary_item['URL']] += 1
+            await clear_failed_url(url, failed_urls)
         else:
+            time_budget = get_url_time_budget(attrs_dict)
             try:
-                await inventory_identifier(page, primary_item, logger, data)
+                await asyncio.wait_for(
+                    inventory_identifier(page, primary_item, logger, data, url_counts, attrs_dict, pages[1:]),
+                    timeout=time_budget
+                )
+            except asyncio.TimeoutError:
+                logger.error(f'Time budget of {time_budget}s exceeded for link: {url}')
+                await record_failed_url(url, failed_urls)
             except TimeoutError:
                 logger.error(f'Timeout problem in link: {url}')
-                failed_urls.add(url)
-                pickle.dump(failed_urls, open('failed_urls.pkl', 'wb'))
+                await record_failed_url(url, failed_urls)
             except NotImplementedError:
                 logger.error(f'NotImplementedError for link: {url}')
-                failed_urls.add(url)
-                pickle.dump(failed_urls, open('failed_urls.pkl', 'wb'))
+                await record_failed_url(url, failed_urls)
+            else:
+                await clear_failed_url(url, failed_urls)
                 
     except Exception as e:
         logger.error(f"Error processing URL {url}: {e}")
-        failed_urls.add(url)
+        await record_failed_url(url, failed_urls)
     finally:
-        export(data)
-        pickle.dump(data, open('data.pkl', 'wb'))
-        await page.close()
-        await context.close()
+        await checkpoint_data(data)
+        for pooled_page in pages:
+            await pooled_page.context.clear_cookies()
+        page_queue.put_nowait(pages)
+
+async def product_worker(url_queue: asyncio.Queue, page_queue: asyncio.Queue,
+                         logger: logging.RootLogger, data: List[Dict[str, Any]],
+                         failed_urls: Set[str], url_counts: Counter[str]) -> None:
+    """
+    Handle product URLs from the queue until it is empty.
+    
+    Args:
+        url_queue: Queue of product URLs left to handle
+        page_queue: Queue holding the pooled page lists
+        logger: Logger instance
+        data: List of existing product data
+        failed_urls: Set of failed URLs
+        url_counts: Number of scraped variations per product URL
+    """
+    while True:
+        try:
+            url = url_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        await handle_url(page_queue, url, logger, data, failed_urls, url_counts)
+
+def start_checkpointing(data: List[Dict[str, Any]]) -> None:
+    """
+    Reset the checkpoint state for a new run.
+    
+    Records already present in data are considered persisted.
+    
+    Args:
+        data: List of existing product data
+    """
+    global _checkpoint_lock, _journaled_count, _handled_since_checkpoint
+    _checkpoint_lock = asyncio.Lock()
+    _journaled_count = len(data)
+    _handled_since_checkpoint = 0
+
+async def checkpoint_data(data: List[Dict[str, Any]], force: bool = False) -> None:
+    """
+    Persist scraping progress after a handled URL.
+    
+    Only the records added since the previous call are appended to the journal.
+    Every checkpoint_every URLs (or when forced) the full data list is written
+    to data.json and output.csv, and the journal is truncated. The file writes
+    run in a worker thread so other tabs keep scraping meanwhile.
+    
+    Args:
+        data: List of existing product data
+        force: Write a full checkpoint regardless of the URL counter
+    """
+    global _journaled_count, _handled_since_checkpoint
+    
+    async with _checkpoint_lock:
+        new_records = data[_journaled_count:]
+        _journaled_count = len(data)
+        
+        _handled_since_checkpoint += 1
+        records = None
+        if force or _handled_since_checkpoint >= checkpoint_every:
+            records = list(data)
+            _handled_since_checkpoint = 0
+        
+        await asyncio.to_thread(write_checkpoint, new_records, records)
+
+def write_checkpoint(new_records: List[Dict[str, Any]], 
+                     records: Optional[List[Dict[str, Any]]] = None) -> None:
+    """
+    Write scraping progress to disk.
+    
+    Args:
+        new_records: Records to append to the data journal
+        records: Full data snapshot to write to data.json and output.csv, if any
+    """
+    append_data_journal(new_records)
+    
+    if records is not None:
+        export(records)
+        save_data(records)
+
+async def record_failed_url(url: str, failed_urls: Set[str]) -> None:
+    """
+    Add a URL to the failed set and append it to the failed URLs log.
+    
+    The write shares the checkpoint lock and runs in a worker thread.
+    
+    Args:
+        url: Product URL that failed
+        failed_urls: Set of failed URLs
+    """
+    async with _checkpoint_lock:
+        if url in failed_urls:
+            return
+        failed_urls.add(url)
+        await asyncio.to_thread(append_failed_url, url)
+
+async def clear_failed_url(url: str, failed_urls: Set[str]) -> None:
+    """
+    Drop a URL that has now been handled from the failed set and log.
+    
+    Args:
+        url: Product URL that succeeded
+        failed_urls: Set of failed URLs
+    """
+    async with _checkpoint_lock:
+        if url not in failed_urls:
+            return
+        failed_urls.discard(url)
+        await asyncio.to_thread(save_failed_urls, sorted(failed_urls))
 
-def load_products_urls() -> Set[str]:
+def append_failed_url(url: str) -> None:
     """
-    Load existing product URLs from pickle file.
+    Append a URL to the failed URLs log.
+    
+    Args:
+        url: Product URL that failed
+    """
+    with open(failed_urls_path, 'a', encoding='utf-8') as file:
+        file.write(url + '\n')
+
+def save_failed_urls(urls: List[str]) -> None:
+    """
+    Rewrite the failed URLs log with the given URLs.
+    
+    Args:
+        urls: Product URLs that are still failing
+    """
+    tmp_path = failed_urls_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.writelines(url + '\n' for url in urls)
+    os.replace(tmp_path, failed_urls_path)
+
+def load_failed_urls() -> Set[str]:
+    """
+    Load previously failed product URLs from the failed URLs log.
     
     Returns:
-        Set[str]: Set of existing product URLs
+        Set[str]: Set of failed product URLs
     """
-    if os.path.exists('products_urls.pkl'):
-        return pickle.load(open('products_urls.pkl', 'rb'))
-    else:
+    if not os.path.exists(failed_urls_path):
         return set()
+    with open(failed_urls_path, encoding='utf-8') as file:
+        return {line.strip() for line in file if line.strip()}
+
+def record_products_urls(urls: List[str], products_urls: Set[str]) -> List[str]:
+    """
+    Add unseen product URLs to the known set and append them to the URLs file.
+    
+    The check and the write run without awaiting, so concurrent listings
+    never record the same URL twice.
+    
+    Args:
+        urls: Product URLs found on a listing page
+        products_urls: Set of known product URLs
+        
+    Returns:
+        List[str]: URLs that were not known yet
+    """
+    new_urls = [url for url in dict.fromkeys(urls) if url not in products_urls]
+    products_urls.update(new_urls)
+    append_products_urls(new_urls)
+    return new_urls
+
+async def handle_listing_page(context: BrowserContext, listing_url: str, page_id: int,
+                              logger: logging.RootLogger, products_urls: Set[str]) -> List[str]:
+    """
+    Collect the product URLs from a single pagination page of a listing.
+    
+    Args:
+        context: Playwright browser context shared by the listing
+        listing_url: Listing page URL to process
+        page_id: Pagination page number
+        logger: Logger instance
+        products_urls: Set of known product URLs
+        
+    Returns:
+        List[str]: New product URLs found on the page, empty on failure
+    """
+    page = await context.new_page()
+    
+    try:
+        await page.goto(listing_url + f'?page={page_id}', wait_until='domcontentloaded')
+        new_urls = record_products_urls(get_page_products_urls(await snapshot(page)), products_urls)
+        logger.info(f"Page {page_id}: Found {len(new_urls)} new products")
+        return new_urls
+        
+    except Exception as e:
+        logger.error(f"Error processing page {page_id}: {e}")
+        return []
+    finally:
+        await page.close()
 
-async def handle_listing(browser: Browser, listing_url: str, logger: logging.RootLogger, 
-                        data: List[Dict[str, Any]]) -> None:
+async def handle_listing(context: BrowserContext, listing_url: str, logger: logging.RootLogger, 
+                        data: List[Dict[str, Any]], products_urls: Set[str]) -> None:
     """
     Handle the listing page extraction logic to collect product URLs.
     
+    The first page is used to find the page count and its products; the
+    remaining pagination pages are fetched concurrently. All listings share
+    one long-lived context and only open and close pages in it. New URLs are
+    appended to the URLs file as each page is read.
+    
     Args:
-        browser: Playwright browser instance
+        context: Playwright browser context shared by the listings
         listing_url: Listing page URL to process
         logger: Logger instance
         data: List of existing product data
+        products_urls: Set of known product URLs
     """
-    context = await browser.new_context()
-    context.set_default_timeout(5000)
     page = await context.new_page()
     
     try:
-        await page.goto(listing_url)
-        total_pages = await get_total_pages(page)
+        await page.goto(listing_url, wait_until='domcontentloaded')
+        tree = await snapshot(page)
+        total_pages = get_total_pages(tree)
         
         logger.info(f'{total_pages} pages found for the listing URL {page.url}')
+        new_urls = record_products_urls(get_page_products_urls(tree), products_urls)
+        logger.info(f"Page 1: Found {len(new_urls)} new products")
         await page.close()
         
-        for page_id in range(1, total_pages + 1):
-            listing_page_context = await browser.new_context()
-            page = await listing_page_context.new_page()
-            
-            try:
-                await page.goto(listing_url + f'?page={page_id}')
-                products_urls = load_products_urls()
-                new_urls = await get_page_products_urls(page)
-                products_urls = products_urls.union(new_urls)
-                pickle.dump(products_urls, open('products_urls.pkl', 'wb'))
-                
-                logger.info(f"Page {page_id}: Found {len(new_urls)} new products")
-                
-            except Exception as e:
-                logger.error(f"Error processing page {page_id}: {e}")
-            finally:
-                await page.close()
-                await listing_page_context.close()
+        page_tasks = [
+            handle_listing_page(context, listing_url, page_id, logger, products_urls)
+            for page_id in range(2, total_pages + 1)
+        ]
+        await gather_with_concurrency(listing_pages_concurrency, *page_tasks)
                 
     except Exception as e:
         logger.error(f"Error processing listing {listing_url}: {e}")
     finally:
-        await context.close()
-
-async def get_attr_values(attr_handle: ElementHandle) -> List[str]:
-    """
-    Extract attribute values from an attribute handle.
-    
-    Args:
-        attr_handle: Playwright element handle for attribute
-        
-    Returns:
-        List[str]: List of attribute values
-    """
-    options = await attr_handle.query_selector_all('//option')
-    values = []
-    
-    for option in options:
-        value = await option.get_attribute('value')
-        if value:
-            values.append(value)
-    
-    return values
+        if not page.is_closed():
+            await page.close()
 
 async def get_options_dict(page: Page) -> Dict[ElementHandle, List[str]]:
     """
     Get dictionary of attribute handles and their available values.
     
+    The values of every select are read by a single evaluate call instead of
+    one query per select and one attribute read per option.
+    
     Args:
         page: Playwright page object
         
     Returns:
         Dict[ElementHandle, List[str]]: Dictionary mapping attribute handles to their values
     """
-    attrs = await page.query_selector_all('//select[contains(@name,"attribute")]')
-    attrs_values_dict = {}
-    
-    for attr in attrs:
-        attrs_values_dict[attr] = await get_attr_values(attr)
-    
-    return attrs_values_dict
+    attrs = await page.query_selector_all(attribute_selects_xpath)
+    attrs_values = await page.evaluate(option_values_script)
+    return dict(zip(attrs, attrs_values))
 
 async def select_attr_option(option_handle: ElementHandle, attr_value: str) -> None:
     """
@@ -311,10 +691,47 @@ async def select_attr_option(option_handle: ElementHandle, attr_value: str) -> N
     """
     await option_handle.select_option(attr_value)
 
+async def select_variant_option(page: Page, option_handle: ElementHandle, attr_value: str,
+                                timeout: int = 1500) -> Optional[int]:
+    """
+    Select an attribute option and wait for the storefront to refresh the variant.
+    
+    Returns as soon as the product-attributes request completes instead of
+    sleeping for a fixed delay. If no request is observed within the timeout,
+    the selection is assumed to be applied.
+    
+    Args:
+        page: Playwright page object
+        option_handle: Playwright element handle for option
+        attr_value: Value to select
+        timeout: Maximum time to wait for the variant update in milliseconds
+        
+    Returns:
+        Optional[int]: Stock level reported by the storefront for the selected
+        variant, or None if the store does not expose it
+    """
+    try:
+        async with page.expect_response(lambda response: variant_update_url in response.url, timeout=timeout) as response_value:
+            await select_attr_option(option_handle, attr_value)
+        response = await response_value.value
+        response_obj = await response.json()
+    except (Error, JSONDecodeError):
+        return None
+    
+    variant_data = response_obj.get('data') if isinstance(response_obj, dict) else None
+    stock = variant_data.get('stock') if isinstance(variant_data, dict) else None
+    return stock if isinstance(stock, int) else None
+
 async def try_inventory_quantity(page: Page, check_value: int, logger: logging.RootLogger) -> bool:
     """
     Test if a specific quantity can be added to cart.
     
+    The cart response is awaited from before the click, so it cannot be missed.
+    The click relies on the locator actionability checks and is retried
+    cart_add_retries times with exponential backoff, but only while the click
+    itself fails: once it went through, a missing response raises instead of
+    adding the quantity to the cart a second time.
+    
     Args:
         page: Playwright page object
         check_value: Quantity to test
@@ -322,44 +739,41 @@ async def try_inventory_quantity(page: Page, check_value: int, logger: logging.R
         
     Returns:
         bool: True if quantity can be added, False otherwise
-    """
-    try:
-        await page.fill('//input[@name="qty[]"]', str(check_value))
         
-        count = 0
-        while True:
-            try:
-
-                await page.click('//input[@id="form-action-addToCart"]')
-                break
-            except TimeoutError:
-                count += 1
-                if count % 5 == 0:
-                    await page.reload()
-                    continue
-                
-                logger.debug(f'Reclick attempt {count} for: {page.url}')
-                continue
-        
-        async with page.expect_response('https://blackeaglearrows.com/remote/v1/cart/add') as response_value:
+    Raises:
+        TimeoutError: If the button cannot be clicked or the add-to-cart
+            response never arrives
+    """
+    await page.locator('input[name="qty[]"]').first.fill(str(check_value), timeout=1500)
+    add_to_cart_button = page.locator('#form-action-addToCart')
+    
+    for attempt in range(cart_add_retries + 1):
+        clicked = False
+        try:
+            async with page.expect_response(cart_add_url, timeout=cart_add_timeout) as response_value:
+                await add_to_cart_button.click(timeout=cart_add_timeout)
+                clicked = True
             response = await response_value.value
-            response_obj = await response.json()
-            
-            try:
-                if response_obj['data'].get('error'):
-                    await page.click('//button[@class="confirm button"]')
-                    return False
-                else:
-                    await page.click('//div[@id="previewModal"]//button[@class="modal-close"]')
-                    return True
-            except KeyError:
-                return True
-                
-    except Exception as e:
-        logger.error(f"Error testing inventory quantity {check_value}: {e}")
-        raise TimeoutError # todo later delete this 
-        return False
+            break
+        except TimeoutError:
+            if clicked or attempt == cart_add_retries:
+                logger.error(f"Error testing inventory quantity {check_value} for: {page.url}")
+                raise
+            logger.debug(f'Reclick attempt {attempt + 1} for: {page.url}')
+            await asyncio.sleep(0.5 * 2 ** attempt)
     
+    response_obj = await response.json()
+    try:
+        rejected = response_obj['data'].get('error')
+    except KeyError:
+        return True
+    
+    if rejected:
+        await page.click('//button[@class="confirm button"]')
+        return False
+    await page.click('//div[@id="previewModal"]//button[@class="modal-close"]')
+    return True
+
 async def check_out_of_stock(page: Page) -> bool:
     availability_handle = await page.query_selector(
         '//dt[contains(text(),"Availability:")]'
@@ -374,6 +788,12 @@ async def get_inventory_value(page: Page, check_value: int, logger: logging.Root
     """
     Get the actual inventory value by testing quantities.
     
+    Accepted quantities stay in the cart, so each probe adds the difference
+    between the tested total and what the cart already holds. The tested
+    total doubles until the cart rejects it, then the inventory is bisected
+    between the last accepted and the first rejected totals, one probe per
+    halving.
+    
     Args:
         page: Playwright page object
         check_value: Initial quantity to check
@@ -382,29 +802,23 @@ async def get_inventory_value(page: Page, check_value: int, logger: logging.Root
     Returns:
         int: Actual inventory quantity
     """
-
     inventory = 0
-    try_count = 0
     
     if await check_out_of_stock(page):
         return inventory 
     
-    while True:
-        try_count += 1
-        
-        if try_count > 10:
-            check_value += 50000
-            try_count = -100000
-
-        availability = await try_inventory_quantity(page, check_value, logger)
-        
-        if availability:
-            inventory += check_value
+    # Inventory is in [inventory, upper_bound) at every step
+    upper_bound = check_value
+    while await try_inventory_quantity(page, upper_bound - inventory, logger):
+        inventory = upper_bound
+        upper_bound *= 2
+    
+    while inventory + 1 < upper_bound:
+        middle = (inventory + upper_bound) // 2
+        if await try_inventory_quantity(page, middle - inventory, logger):
+            inventory = middle
         else:
-            check_value = check_value // 2
-            
-        if check_value == 1 and not availability:
-            break
+            upper_bound = middle
     
     return inventory
 
@@ -425,63 +839,127 @@ async def get_select_desc(handle:ElementHandle) -> str:
     """
     Get the description of a select attribute.
     
+    The label is looked up and read in the browser with a single evaluate.
+    
     Args:
         handle: Playwright element handle for select attribute
         
     Returns:
         str: label of the select attribute
     """
-    desc_handle = await handle.query_selector('xpath=.//preceding-sibling::label')
-    desc = await desc_handle.inner_text()
-    return desc.split(':')[0] if desc else ''
+    return await handle.evaluate(select_label_script)
+
+async def probe_variations(page: Page, attr_handles: Optional[List[ElementHandle]],
+                           attr_names: List[str], combinations: Iterator[Tuple[str, ...]],
+                           primary_item: Dict[str, Any], logger: logging.RootLogger,
+                           data: List[Dict[str, Any]], url_counts: Counter[str],
+                           guessed_initial_value: int) -> None:
+    """
+    Identify the inventory of a run of product variations on one tab.
+    
+    Args:
+        page: Playwright page object
+        attr_handles: Option selects of the page, or None to open the product
+            on this page first
+        attr_names: Labels of the option selects
+        combinations: Option value combinations to probe, in order
+        primary_item: Primary product item dictionary
+        logger: Logger instance
+        data: List of existing product data
+        url_counts: Number of scraped variations per product URL
+        guessed_initial_value: Initial guess for inventory quantity
+    """
+    if attr_handles is None:
+        await page.goto(primary_item['URL'])
+        attr_handles = await page.query_selector_all(attribute_selects_xpath)
+    
+    selected_values = [None] * len(attr_handles)
+    listed_stock = None
+    for combination in combinations:
+        # Select attributes, skipping those already set by the previous combination
+        for i, (attr_handle, value) in enumerate(zip(attr_handles, combination)):
+            if selected_values[i] != value:
+                listed_stock = await select_variant_option(page, attr_handle, value)
+                selected_values[i] = value
+        # Create product variation item
+        variation_item = primary_item.copy()
+        variation_item.update(await get_product_item(page))
+        for (desc_key, value_key), attr_name, attr_value in zip(droplist_keys, attr_names, combination):
+            variation_item[desc_key] = str(attr_name)
+            variation_item[value_key] = attr_value
+        # Test inventory quantity, unless the storefront already exposed it
+        if listed_stock is not None:
+            inventory_quantity = listed_stock
+        else:
+            inventory_quantity = await get_inventory_value(page, guessed_initial_value, logger)
+        variation_item['Current stock'] = inventory_quantity
+        
+        logger.info(f"Product variation: {variation_item['product_name']} - Stock: {inventory_quantity}")
+        data.append(variation_item)
+        url_counts[variation_item['URL']] += 1
 
 async def inventory_identifier(page: Page, primary_item: Dict[str, Any], 
                              logger: logging.RootLogger, data: List[Dict[str, Any]], 
+                             url_counts: Counter[str],
+                             attrs_dict: Optional[Dict[ElementHandle, List[str]]] = None,
+                             extra_pages: Sequence[Page] = (),
                              guessed_initial_value: int = 100) -> int:
     """
     Identify inventory quantity for a product by testing cart additions.
     
+    The combinations are split into contiguous runs probed concurrently on the
+    page and the extra pages, so each tab keeps reusing the options it already
+    selected. Every extra page must belong to its own browser context, and so
+    have its own cart: the probes of one tab never land in another tab's cart.
+    
     Args:
         page: Playwright page object
         primary_item: Primary product item dictionary
         logger: Logger instance
         data: List of existing product data
+        url_counts: Number of scraped variations per product URL
+        attrs_dict: Option selects already read from the page, if any
+        extra_pages: Sibling pages, each in its own context, for the other runs
         guessed_initial_value: Initial guess for inventory quantity
         
     Returns:
         int: Number of product variations processed
     """
-    attrs_dict = await get_options_dict(page)
+    if attrs_dict is None:
+        attrs_dict = await get_options_dict(page)
     if not attrs_dict:
         raise NotImplementedError("handling pages with no select inside will be added later")
-    all_combinations = get_all_combinations(*(attrs_dict.values()))
-    for combination in all_combinations:
-        # Select attributes
-        attr_handles = list(attrs_dict.keys())
-        if len(attr_handles) > 1:
-            for i, (attr_handle, value) in enumerate(zip(attr_handles, combination)):
-                await select_attr_option(attr_handle, value)
-                await page.wait_for_timeout(500)
-        elif len(attr_handles) == 1:
-            for attr_handle,values in attrs_dict.items():
-                for value in combination:
-                    await select_attr_option(attr_handle, value)
-                    await page.wait_for_timeout(500)
-        # Create product variation item
-        variation_item = deepcopy(primary_item)
-        variation_item.update(await get_product_item(page))
-        attr_names = [await get_select_desc(handle) for handle in attrs_dict.keys()]
-        for i, (attr_name, attr_value) in enumerate(zip(attr_names, combination)):
-            variation_item[f'{i+1}DroplistDesc'] = str(attr_name)
-            variation_item[f'{i+1}DroplistValue'] = attr_value
-        # Test inventory quantity
-        inventory_quantity = await get_inventory_value(page, guessed_initial_value, logger)
-        variation_item['Current stock'] = inventory_quantity
-        
-        logger.info(f"Product variation: {variation_item['product_name']} - Stock: {inventory_quantity}")
-        data.append(variation_item)
+    combinations_count = count_combinations(*attrs_dict.values())
+    if not combinations_count:
+        return 0
+    attr_handles = list(attrs_dict.keys())
+    attr_names = [await get_select_desc(handle) for handle in attr_handles]
     
-    return len(all_combinations)
+    # Each run streams its own slice of the combinations instead of sharing
+    # a materialized list
+    run_size = -(-combinations_count // min(1 + len(extra_pages), combinations_count))
+    combination_runs = [
+        islice(get_all_combinations(*attrs_dict.values()), start, start + run_size)
+        for start in range(0, combinations_count, run_size)
+    ]
+    
+    results = await asyncio.gather(
+        *(
+            probe_variations(
+                run_page, attr_handles if run_page is page else None, attr_names, run,
+                primary_item, logger, data, url_counts, guessed_initial_value
+            )
+            for run_page, run in zip([page, *extra_pages], combination_runs)
+        ),
+        return_exceptions=True
+    )
+    
+    # Surface the first failure once every tab has finished its run
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    
+    return combinations_count
 
 async def gather_with_concurrency(n: int, *tasks) -> List[Any]:
     """
@@ -515,22 +993,44 @@ async def run(p, data: List[Dict[str, Any]], headless: bool, pages_number: int,
         logger: Logger instance
         failed_urls: Set of failed URLs
     """
-    browser = await p.chromium.launch(headless=headless)
+    browser = await p.chromium.launch(headless=headless, args=browser_args)
+    
+    # Index scraped variations by URL so handled checks are a dict lookup
+    url_counts = Counter(item.get('URL') for item in data)
+    start_checkpointing(data)
     
     try:
         # First, collect all product URLs from listing pages
-        listing_tasks = [handle_listing(browser, url, logger, data) for url in list(listing_urls)]
-        await gather_with_concurrency(2, *listing_tasks)
-        
-        # Load collected URLs
         products_urls = load_products_urls()
+        listing_context = await create_scraping_context(browser)
+        try:
+            listing_tasks = [handle_listing(listing_context, url, logger, data, products_urls) for url in list(listing_urls)]
+            await gather_with_concurrency(len(listing_tasks), *listing_tasks)
+        finally:
+            await listing_context.close()
+            # Compact the URLs file into one deduplicated copy
+            save_products_urls(products_urls)
+        
         logger.info(f"Collected {len(products_urls)} product URLs")
 
-        # Then process each product URL
-        product_tasks = [handle_url(browser, url, logger, data, failed_urls) for url in list(products_urls)]
-        await gather_with_concurrency(pages_number, *product_tasks)
+        # Then process each product URL on a pool of reusable pages, with one
+        # worker per page pulling URLs from a queue
+        url_queue = asyncio.Queue()
+        for url in products_urls:
+            url_queue.put_nowait(url)
+        
+        page_queue = await create_page_pool(browser, pages_number)
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(pages_number):
+                    task_group.create_task(
+                        product_worker(url_queue, page_queue, logger, data, failed_urls, url_counts)
+                    )
+        finally:
+            await close_page_pool(page_queue)
         
     finally:
+        await checkpoint_data(data, force=True)
         await browser.close()
 
 async def main(*args) -> None:
@@ -547,7 +1047,6 @@ async def main(*args) -> None:
         
         # Generate final outputs
         update_output(data)
-        create_hypertext()
         
         # Generate report
         if os.path.exists('template.txt'):
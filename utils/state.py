@@ -0,0 +1,197 @@
+"""
+State Utilities for Black Eagle Arrows Inventory Scraper
+
+This module holds the persisted scraping state shared by the launcher and the
+standalone scraper script. It defines the columns that identify a product
+variation and loads previously scraped data from disk.
+
+Data is stored as JSON with orjson: a full checkpoint in data.json plus an
+append-only JSON Lines journal of the records scraped since. Loading is cached
+so the data is read and deduplicated at most once per process, whichever entry
+point asks for it first.
+
+Author: Project Developer
+License: MIT
+"""
+
+from functools import cache
+from typing import List, Dict, Any, Set
+import logging
+import os
+import pickle
+import orjson
+
+# Columns that uniquely identify a production variation
+cols = [
+    'SKU',
+    '1DroplistDesc',
+    '1DroplistValue',
+    '2DroplistDesc',
+    '2DroplistValue',
+    '3DroplistDesc',
+    '3DroplistValue',
+    '4DroplistDesc',
+    '4DroplistValue'
+]
+
+# (description, value) column pairs for each of the four option slots
+droplist_keys = [
+    ('1DroplistDesc', '1DroplistValue'),
+    ('2DroplistDesc', '2DroplistValue'),
+    ('3DroplistDesc', '3DroplistValue'),
+    ('4DroplistDesc', '4DroplistValue')
+]
+
+# Full checkpoint of the scraped data
+data_path = 'data.json'
+
+# Pickle checkpoint written by older versions, read when data.json is missing
+legacy_data_path = 'data.pkl'
+
+# Append-only journal of records scraped since the last full checkpoint
+data_journal_path = 'data_journal.jsonl'
+
+# Product URLs discovered on the listing pages, one per line
+products_urls_path = 'products_urls.txt'
+
+# Pickled product URLs written by older versions, read when the text file is missing
+legacy_products_urls_path = 'products_urls.pkl'
+
+def load_data_journal() -> List[Dict[str, Any]]:
+    """
+    Replay the records appended to the data journal since the last checkpoint.
+
+    A partially written trailing line (e.g. after a crash) is ignored.
+
+    Returns:
+        List[Dict[str, Any]]: Journaled records in write order
+    """
+    records = []
+    if not os.path.exists(data_journal_path):
+        return records
+
+    with open(data_journal_path, 'rb') as file:
+        for line in file:
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                break
+    return records
+
+def append_data_journal(records: List[Dict[str, Any]]) -> None:
+    """
+    Append records to the data journal, one JSON document per line.
+
+    Args:
+        records: Newly scraped records
+    """
+    if not records:
+        return
+    with open(data_journal_path, 'ab') as file:
+        file.write(b''.join(orjson.dumps(record) + b'\n' for record in records))
+
+def save_data(data: List[Dict[str, Any]]) -> None:
+    """
+    Write a full data checkpoint and truncate the data journal.
+
+    The checkpoint is written to a temporary file and moved into place, so
+    an interrupted write never leaves a truncated data.json behind.
+
+    Args:
+        data: List of product data
+    """
+    temporary_path = data_path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(orjson.dumps(data))
+    os.replace(temporary_path, data_path)
+    open(data_journal_path, 'wb').close()
+
+def save_products_urls(urls: Set[str]) -> None:
+    """
+    Write the discovered product URLs, one per line.
+
+    Args:
+        urls: Product URLs
+    """
+    temporary_path = products_urls_path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        file.writelines(url + '\n' for url in urls)
+    os.replace(temporary_path, products_urls_path)
+
+def append_products_urls(urls: List[str]) -> None:
+    """
+    Append newly discovered product URLs, one per line.
+
+    Args:
+        urls: Product URLs not yet written
+    """
+    if not urls:
+        return
+    with open(products_urls_path, 'a', encoding='utf-8') as file:
+        file.writelines(url + '\n' for url in urls)
+
+def load_products_urls() -> Set[str]:
+    """
+    Load the discovered product URLs.
+
+    Returns:
+        Set[str]: Product URLs, empty if none were saved
+    """
+    if os.path.exists(products_urls_path):
+        with open(products_urls_path, encoding='utf-8') as file:
+            return {line.strip() for line in file if line.strip()}
+    if os.path.exists(legacy_products_urls_path):
+        with open(legacy_products_urls_path, 'rb') as file:
+            return set(pickle.load(file))
+    return set()
+
+@cache
+def load_existing_data(logger: logging.Logger) -> List[Dict[str, Any]]:
+    """
+    Load existing data from the JSON checkpoint and data journal.
+
+    Records are deduplicated on the variation columns, keeping the first
+    occurrence. The result is cached, so later calls return the same list.
+
+    Args:
+        logger: Logger instance
+
+    Returns:
+        List[Dict[str, Any]]: Deduplicated product data, empty if nothing was saved
+    """
+    data: List[Dict[str, Any]] = []
+
+    if not any(os.path.exists(path) for path in (data_path, legacy_data_path, data_journal_path)):
+        logger.info("No existing data found, starting fresh")
+        return data
+
+    try:
+        raw = []
+        sources = []
+        if os.path.exists(data_path):
+            with open(data_path, 'rb') as file:
+                raw = orjson.loads(file.read())
+            sources.append(data_path)
+        elif os.path.exists(legacy_data_path):
+            with open(legacy_data_path, 'rb') as file:
+                raw = pickle.load(file)
+            sources.append(legacy_data_path)
+        if os.path.exists(data_journal_path):
+            raw.extend(load_data_journal())
+            sources.append(data_journal_path)
+
+        # Keep the first record of each variation key
+        seen = set()
+        for record in raw:
+            key = tuple(record.get(col, '') for col in cols)
+            if key in seen:
+                continue
+            seen.add(key)
+            data.append(record)
+
+        logger.info(f"Loaded {len(data)} existing records from {' and '.join(sources)}")
+    except Exception as e:
+        logger.error(f"Error loading existing data: {e}")
+        data.clear()
+
+    return data